@@ -0,0 +1,246 @@
+# Raw ANSI backend.
+#
+# `--backend ansi` skips curses entirely. AnsiScreen stands in for stdscr:
+# the FrameBuffer runs written to it (already diffed and merged into
+# same-attribute runs) are turned into escape codes straight away — a cursor
+# move only where the next run doesn't start at the cursor, an SGR change
+# only where the attribute differs from the last one sent — and the whole
+# frame goes out in a single os.write() on refresh().
+#
+# Attributes stay curses attribute ints (color pair + A_* flags) so every
+# renderer works unchanged; colors.PAIRS says what each pair means. Extended
+# colors are sent as 24-bit SGR when the terminal advertises truecolor, so
+# they don't depend on init_color() or the terminal's pair limit.
+#
+# frame_lines() renders a whole FrameBuffer the same way, for output that
+# isn't a live screen (--once snapshots).
+
+from __future__ import annotations
+import curses
+import functools
+import os
+import re
+import select
+import sys
+import termios
+import tty
+
+from colors import PAIRS, EXTENDED_COLORS
+from keys import ESCAPE_KEYS
+
+# How long a lone ESC waits for the rest of an escape sequence (seconds)
+ESC_DELAY = 0.025
+
+_ESCAPE = re.compile(rb"\x1b(?:\[[0-9;?]*[ -/]*[@-~]|O[@-~])")
+
+_FLAGS = [
+    (curses.A_BOLD,      "1"),
+    (curses.A_DIM,       "2"),
+    (curses.A_UNDERLINE, "4"),
+    (curses.A_BLINK,     "5"),
+    (curses.A_REVERSE,   "7"),
+]
+
+
+def color_depth() -> int:
+    """24 for truecolor terminals, 256 for 256-color ones, else 8."""
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return 24
+    return 256 if "256color" in os.environ.get("TERM", "") else 8
+
+
+def _rgb_to_256(r: int, g: int, b: int) -> int:
+    """Nearest xterm-256 color: the gray ramp for grays, else the 6×6×6 cube."""
+    if r == g == b:
+        return 232 + max(0, min(23, round((r - 8) / 10)))
+    return 16 + 36 * round(r / 51) + 6 * round(g / 51) + round(b / 51)
+
+
+def _color(color: int, base: int, depth: int) -> str:
+    if color < 8:
+        return str(base + color)
+    r, g, b = EXTENDED_COLORS[color]
+    if depth == 24:
+        return f"{base + 8};2;{r};{g};{b}"
+    if depth == 256:
+        return f"{base + 8};5;{_rgb_to_256(r, g, b)}"
+    return str(base + curses.COLOR_WHITE)
+
+
+@functools.lru_cache(maxsize=None)
+def sgr(attr: int, depth: int) -> str:
+    """The escape sequence that sets a curses attribute (color pair + A_* flags) from scratch."""
+    codes = ["0"] + [code for flag, code in _FLAGS if attr & flag]
+    fg, bg = PAIRS.get((attr & curses.A_COLOR) >> 8, (-1, -1))
+    if fg != -1:
+        codes.append(_color(fg, 30, depth))
+    if bg != -1:
+        codes.append(_color(bg, 40, depth))
+    return f"\x1b[{';'.join(codes)}m"
+
+
+def frame_lines(fb, depth: int | None = None) -> list[str]:
+    """Every row of a FrameBuffer as a line of text with SGR codes, reset at the end."""
+    depth = depth or color_depth()
+    lines = []
+    for chars, attrs in zip(fb.chars, fb.attrs):
+        parts, current = [], 0
+        for ch, attr in zip(chars, attrs):
+            if attr != current:
+                parts.append(sgr(attr, depth))
+                current = attr
+            parts.append(ch)
+        lines.append("".join(parts).rstrip(" ") + "\x1b[0m")
+    return lines
+
+
+class AnsiScreen:
+    """
+    The slice of the curses stdscr API the render loops use, writing ANSI
+    escape codes to a terminal file descriptor. Use as a context manager
+    (or through wrapper()) to get raw input and the alternate screen.
+    """
+
+    def __init__(self, fd_in: int | None = None, fd_out: int | None = None, depth: int | None = None):
+        self.fd_in    = sys.stdin.fileno()  if fd_in  is None else fd_in
+        self.fd_out   = sys.stdout.fileno() if fd_out is None else fd_out
+        self.depth    = depth or color_depth()
+        self._out:  list[str] = []
+        self._attr    = None              # attribute last sent; None = unknown
+        self._cursor  = None              # (y, x) the cursor is at; None = unknown
+        self._keys    = b""
+        self._timeout = None              # getch() wait in seconds; None = block
+        self._saved   = None
+        self.h, self.w = self._size()
+
+    def __enter__(self) -> "AnsiScreen":
+        self._saved = termios.tcgetattr(self.fd_in)
+        tty.setcbreak(self.fd_in)
+        # Alternate screen, hidden cursor, cleared
+        self._write("\x1b[?1049h\x1b[?25l\x1b[0m\x1b[2J")
+        return self
+
+    def __exit__(self, *exc):
+        self._write("\x1b[0m\x1b[?25h\x1b[?1049l")
+        termios.tcsetattr(self.fd_in, termios.TCSADRAIN, self._saved)
+
+    # Output
+    def _size(self) -> tuple[int, int]:
+        cols, rows = os.get_terminal_size(self.fd_out)
+        return rows, cols
+
+    def getmaxyx(self) -> tuple[int, int]:
+        self.h, self.w = self._size()
+        return self.h, self.w
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0):
+        if not 0 <= y < self.h or not 0 <= x < self.w:
+            return
+        text = text[:self.w - x]
+        out  = self._out
+        if self._cursor != (y, x):
+            if self._cursor and self._cursor[0] == y:
+                out.append(f"\x1b[{x + 1}G")
+            else:
+                out.append(f"\x1b[{y + 1};{x + 1}H")
+        if attr != self._attr:
+            out.append(sgr(attr, self.depth))
+            self._attr = attr
+        out.append(text)
+        # Past the last column the terminal is waiting to wrap: position unknown
+        end          = x + len(text)
+        self._cursor = (y, end) if end < self.w else None
+
+    def addch(self, y: int, x: int, ch, attr: int = 0):
+        self.addstr(y, x, chr(ch) if isinstance(ch, int) else ch, attr)
+
+    def erase(self):
+        self._out.append("\x1b[0m\x1b[2J")
+        self._attr   = 0
+        self._cursor = None
+
+    clear = erase
+
+    def newwin(self, h: int, w: int, y: int, x: int) -> "_AnsiWindow":
+        """A window onto part of the screen, for the region layout."""
+        return _AnsiWindow(self, h, w, y, x)
+
+    def noutrefresh(self):
+        pass
+
+    def doupdate(self):
+        """Send everything drawn since the last update in one write."""
+        if self._out:
+            self._write("".join(self._out))
+            self._out.clear()
+
+    refresh = doupdate
+
+    def _write(self, text: str):
+        data = text.encode("utf-8")
+        while data:
+            data = data[os.write(self.fd_out, data):]
+
+    # Input
+    def timeout(self, ms: int):
+        self._timeout = None if ms < 0 else ms / 1000
+
+    def nodelay(self, flag: bool):
+        self._timeout = 0 if flag else None
+
+    def keypad(self, _flag: bool):
+        pass
+
+    def getch(self) -> int:
+        """Next key as keys.read_key() would report it (arrow keys as KEY_*), or -1 on timeout."""
+        if not self._keys and not self._read(self._timeout):
+            return -1
+        keys = self._keys
+        if keys[:1] != b"\x1b":
+            self._keys = keys[1:]
+            return keys[0]
+        if len(keys) == 1 and self._read(ESC_DELAY):
+            keys = self._keys
+        match = _ESCAPE.match(keys)
+        if not match:
+            self._keys = keys[1:]
+            return 27                     # a plain Esc press
+        self._keys = keys[match.end():]
+        return ESCAPE_KEYS.get(match.group(), -1)
+
+    def _read(self, timeout: float | None) -> bool:
+        ready, _, _ = select.select([self.fd_in], [], [], timeout)
+        if not ready:
+            return False
+        self._keys += os.read(self.fd_in, 1024)
+        return True
+
+
+class _AnsiWindow:
+    """A sub-window of an AnsiScreen: drawing is offset into it and clipped to it."""
+
+    __slots__ = ("screen", "h", "w", "y", "x")
+
+    def __init__(self, screen: AnsiScreen, h: int, w: int, y: int, x: int):
+        self.screen = screen
+        self.h, self.w = h, w
+        self.y, self.x = y, x
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.h, self.w
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0):
+        if 0 <= y < self.h and 0 <= x < self.w:
+            self.screen.addstr(self.y + y, self.x + x, text[:self.w - x], attr)
+
+    def addch(self, y: int, x: int, ch, attr: int = 0):
+        self.addstr(y, x, chr(ch) if isinstance(ch, int) else ch, attr)
+
+    def noutrefresh(self):
+        pass
+
+
+def wrapper(func, *args, **kwargs):
+    """curses.wrapper() for the ANSI backend: func(screen, ...) with the terminal set up and restored."""
+    with AnsiScreen() as screen:
+        return func(screen, *args, **kwargs)
@@ -1,171 +1,272 @@
 from __future__ import annotations
 import curses
-import random
 import time
-import threading
-
-from assets import CLOUD_SHAPES, CLOUD_SHAPES_2, HOUSE
-from colors import setup_colors
-from particles import RainDrop, Snowflake, Cloud
-from scenes import (
-    draw_house,
-    draw_rain_scene, draw_thunder_scene, draw_snow_scene,
-    draw_sun_scene, draw_cloud_scene, draw_fog_scene,
+
+import startup
+
+from ansi import AnsiScreen
+from cache import WeatherCache, default_ttl, last_known
+from daemon import DaemonClient, open_fetcher
+from fetcher import RefreshSchedule, DEFAULT_REFRESH
+from idle import IdlePolicy, DEFAULT_IDLE_AFTER
+from keys import focus_reporting
+from colors import setup_colors, error_color
+from layers import LayerCache
+from particles import spawn_particles, resize_particles, update_particles
+from profiler import FrameProfiler
+from quality import Quality, QualityGovernor, HIGH
+from regions import Regions
+from scheduler import FrameScheduler, SimClock
+from sprites import compile_all
+from scenes import draw_scene
+from ui import (
+    draw_loading, draw_info_panel, draw_status_bar, draw_hud,
+    KEY_HELP, KEY_HELP_FORECAST,
 )
-from ui import draw_loading, draw_info_panel, draw_status_bar
-from weather import fetch_weather, make_demo_data
-
-# How many particles to spawn (capped so small terminals aren't overwhelmed)
-MAX_DROPS  = 60
-MAX_FLAKES = 40
-
-# Target frame rate
-FPS        = 20
-FRAME_TIME = 1.0 / FPS
-
-
-def _spawn_particles(w: int, h: int) -> dict:
-    """Create the initial particle pools and cloud fleet."""
-    num_drops  = min(MAX_DROPS,  w // 2)
-    num_flakes = min(MAX_FLAKES, w // 2)
-    return {
-        "drops":  [RainDrop(w, h)    for _ in range(num_drops)],
-        "flakes": [Snowflake(w, h)   for _ in range(num_flakes)],
-        "clouds": [
-            Cloud(w, random.randint(1, 6), CLOUD_SHAPES),
-            Cloud(w, random.randint(2, 5), CLOUD_SHAPES_2),
-            Cloud(w, random.randint(1, 4), CLOUD_SHAPES),
-            Cloud(w, random.randint(3, 7), CLOUD_SHAPES_2),
-            Cloud(w, random.randint(1, 5), CLOUD_SHAPES),
-        ],
-    }
-
-
-def _update_particles(particles: dict, wtype: str):
-    """Advance all particles one step. Thunder drops are faster and more diagonal."""
-    for drop in particles["drops"]:
-        if wtype == "thunder":
-            if drop.speed < 2.5:
-                drop.speed = random.uniform(2.5, 4.0)
-            drop.update(wind=0.9)
-        else:
-            if drop.speed > 2.5:
-                drop.speed = random.uniform(1.2, 2.0)
-            drop.update(wind=0.15)
-
-    for flake in particles["flakes"]:
-        flake.update()
-
-    for cloud in particles["clouds"]:
-        cloud.update()
-
-
-def _draw_scene(win, wtype: str, particles: dict, frame: int, weather_data: dict):
-    """Route to the correct scene renderer based on weather type."""
-    drops  = particles["drops"]
-    flakes = particles["flakes"]
-    clouds = particles["clouds"]
-
-    scene_map = {
-        "rain":    lambda: draw_rain_scene(win, drops, frame),
-        "thunder": lambda: draw_thunder_scene(win, drops, frame),
-        "snow":    lambda: draw_snow_scene(win, flakes),
-        "sun":     lambda: draw_sun_scene(win, clouds[:2], frame, weather_data),
-        "cloud":   lambda: draw_cloud_scene(win, clouds),
-        "fog":     lambda: draw_fog_scene(win, frame),
-    }
-    scene_map.get(wtype, scene_map["sun"])()
-
-
-def _start_fetch(city: str | None, demo_mode: str | None, result_box: list):
-    """Kick off a background thread to fetch weather without blocking the UI."""
-    def _worker():
-        if demo_mode:
-            result_box[0] = make_demo_data(demo_mode)
-        else:
-            result_box[0] = fetch_weather(city)
+from weather import forecast_slots, forecast_view
+
+# Default target frame rate (override with --fps)
+FPS = 20
+
+# Stand-in for callers that don't profile (always disabled)
+_NO_PROFILER = FrameProfiler()
+
 
-    thread = threading.Thread(target=_worker, daemon=True)
-    thread.start()
-    return thread
+def _panel_key(version: tuple[int, int], weather_data: dict | None):
+    """
+    What the info panel depends on: which result and forecast slot it shows,
+    plus the minute while an age is shown.
+    """
+    if weather_data and weather_data.get("stale"):
+        return version, int(time.time() // 60)
+    return version
 
 
-def run(stdscr, city: str | None, demo_mode: str | None):
+def render_frame(regions: Regions, layers: LayerCache, wtype: str, particles: dict,
+                 t: float, weather_data: dict, frame: int, prof: FrameProfiler = None,
+                 level: Quality = HIGH, version: tuple[int, int] = (0, 0)):
+    """
+    Compose one frame into the regions: cached static layer, moving things and
+    house into the scene; the info panel only if what it shows changed; the
+    status bar (its frame counter always does). `version` is the (fetch
+    generation, forecast slot) of `weather_data`.
+    """
+    prof  = prof or _NO_PROFILER
+    scene = regions.scene
+    layer = layers.get(wtype, regions.h, regions.w)
+    scene.fb.blit(layer.base)
+    draw_scene(scene.fb, wtype, particles, t, weather_data, scene.fb.h - 1, level)
+    prof.lap("scene")
+    scene.fb.draw_runs(layer.overlay)
+    if prof.hud:
+        draw_hud(scene.fb, prof.hud_lines())
+    scene.dirty = True
+    prof.lap("house")
+
+    panel = regions.panel
+    if regions.panel_changed(_panel_key(version, weather_data)):
+        panel.fb.erase()
+        draw_info_panel(panel.fb, weather_data, t)
+        panel.dirty = True
+    keys = KEY_HELP_FORECAST if forecast_slots(weather_data) else KEY_HELP
+    draw_status_bar(regions.status.fb, frame, level.name, keys)
+    regions.status.dirty = True
+    prof.lap("info")
+
+
+def run(stdscr, city: str | None, demo_mode: str | None,
+        fps: int = FPS, adaptive: bool = False,
+        profile_out: str | None = None, trace_out: str | None = None,
+        cache_ttl: float | None = None, use_cache: bool = True,
+        refresh: float = DEFAULT_REFRESH,
+        socket_path: str | None = None, use_daemon: bool = True, lean: bool = False,
+        quality: str = "auto", idle_after: float = DEFAULT_IDLE_AFTER, idle_fps: int = 0):
     """Main curses loop — called via curses.wrapper()."""
-    setup_colors()
-    curses.curs_set(0)
-    stdscr.nodelay(True)
-    stdscr.timeout(int(FRAME_TIME * 1000))
+    startup.mark("curses ready")
+    if demo_mode:
+        refresh = 0
+    if cache_ttl is None:
+        cache_ttl = default_ttl(refresh)      # older than one refresh interval isn't fresh
+    prof    = FrameProfiler(enabled=bool(profile_out), trace=bool(trace_out))
+    cache   = WeatherCache(ttl=cache_ttl) if use_cache and not demo_mode else None
+    fetcher = open_fetcher(cache, demo_mode, socket_path, use_daemon, lean=lean)
+    focus_reporting(True)
+    try:
+        _loop(stdscr, city, fps, adaptive, prof, cache, fetcher, refresh, QualityGovernor(quality),
+              IdlePolicy(idle_after, idle_fps))
+    finally:
+        focus_reporting(False)
+        prof.dump(profile_out, trace_out)
+
+
+def _loop(stdscr, city: str | None, fps: int, adaptive: bool, prof: FrameProfiler,
+          cache: WeatherCache | None, fetcher, refresh: float, governor: QualityGovernor,
+          idle: IdlePolicy):
+    term = stdscr if isinstance(stdscr, AnsiScreen) else None
+    if term is None:
+        setup_colors()            # the ANSI backend maps color pairs itself
+        curses.curs_set(0)
+    compile_all()
 
     h, w         = stdscr.getmaxyx()
-    particles    = _spawn_particles(w, h)
-    frame        = 0
-    weather_data = None
-    loading      = True
-    result_box   = [None]
+    regions      = None              # windows are made once the terminal is big enough
+    layers       = LayerCache()
+    sched        = FrameScheduler(fps, adaptive)
+    clock        = SimClock()
+    particles    = spawn_particles(w, h, governor.level.particles)
+    frame        = 0                 # frames actually drawn
+    dirty        = True              # something other than time changed the picture
+    shown_gen    = 0                 # generation of the fetch result on screen
+    ahead        = 0                 # forecast slots scrubbed ahead of now (0 = current)
+    age_minute   = None              # minute the "last known, N min old" text was drawn in
 
-    _start_fetch(city, demo_mode, result_box)
+    # Draw the last known weather straight away; only go to the network when
+    # there's nothing cached or what's cached has expired. A daemon refreshes
+    # on its own schedule and pushes updates once we subscribe.
+    live              = isinstance(fetcher, DaemonClient)
+    weather_data, age = last_known(cache, city, fetcher.lean)
+    schedule          = RefreshSchedule(0 if live else refresh, age)
+    if live or weather_data is None or "stale" in weather_data:
+        fetcher.request(city, force=True)
+        schedule.started()
 
     while True:
-        h, w = stdscr.getmaxyx()
+        # Idle: a low frame rate, or frozen in getch until a key or the next refresh
+        rate = idle.fps if idle.idle and idle.fps > 0 else fps
+        if rate != sched.fps:
+            sched.retarget(rate)
+        frozen = idle.frozen
+
+        # Input — handled the moment it arrives; -1 means the next frame is due
+        if frozen:
+            key = idle.block(stdscr, schedule.next_due, fetcher.pending(city))
+            if key == curses.KEY_RESIZE:
+                key = -1               # redraw at the new size now, still frozen
+        else:
+            key = sched.wait(stdscr)
+        prof.lap("sleep")
+        idle.key(key)
+        if key in (ord("q"), ord("Q"), 27):
+            break
+        if key in (ord("r"), ord("R")):
+            # Current weather stays on screen until the refresh lands;
+            # mashing R while one is in flight doesn't start another
+            fetcher.request(city)
+            schedule.started()
+        if key in (ord("p"), ord("P")):
+            prof.toggle_hud()
+            dirty = True
+        if key in (curses.KEY_LEFT, curses.KEY_RIGHT):
+            # Scrub the forecast timeline — all local, nothing is fetched
+            step  = 1 if key == curses.KEY_RIGHT else -1
+            ahead = max(0, min(forecast_slots(weather_data), ahead + step))
+            dirty = True
+        prof.lap("input")
+        if key != -1:
+            continue
+
+        sched.begin_frame()
+        steps = 0 if frozen else clock.advance()
+        h, w  = stdscr.getmaxyx()
+        if regions and (h, w) != (regions.h, regions.w):
+            regions = None
+            resize_particles(particles, w, h, governor.level.particles)
+            layers.clear()
+            stdscr.clear()
+            stdscr.noutrefresh()
+            dirty = True
 
         # Guard: terminal too small for scenes (need ~50×20 to show info panel + house)
         if h < 20 or w < 50:
             stdscr.clear()
+            regions = None
+            dirty   = True
             try:
-                stdscr.addstr(0, 0, f"Terminal too small — need 50×20, got {w}×{h}", curses.color_pair(7))
+                stdscr.addstr(0, 0, f"Terminal too small — need 50×20, got {w}×{h}", error_color())
             except curses.error:
                 pass
             stdscr.refresh()
-            time.sleep(0.1)
-            if stdscr.getch() in (ord("q"), ord("Q"), 27):
-                break
+            sched.end_frame()
+            prof.end_frame()
             continue
+        if regions is None:
+            # Keys are still read through stdscr and getch() refreshes it, so
+            # leave nothing pending there to paint over the new windows
+            stdscr.noutrefresh()
+            regions = Regions(h, w, term=term)
 
-        # Input
-        key = stdscr.getch()
-        if key in (ord("q"), ord("Q"), 27):
-            break
-        if key in (ord("r"), ord("R")):
-            result_box[0] = None
-            loading       = True
-            _start_fetch(city, demo_mode, result_box)
+        # A daemon that went away leaves the refreshing to us
+        if live and not fetcher.connected:
+            live = False
+            schedule.set_interval(refresh)
 
-        # Check if fetch finished
-        if loading and result_box[0] is not None:
-            weather_data = result_box[0]
-            loading      = False
+        # Pick up a finished fetch (stale or cancelled ones never get published),
+        # then plan the next automatic refresh from how it went
+        latest = fetcher.poll(city)
+        if latest and latest[0] != shown_gen:
+            shown_gen, weather_data = latest
+            ahead = min(ahead, forecast_slots(weather_data))
+            dirty = True
+            schedule.done(weather_data)
+        elif schedule.due() and not fetcher.pending(city):
+            fetcher.request(city)
+            schedule.started()
 
-        stdscr.erase()
+        # A shown age moves on once a minute even when nothing else does (frozen wakes too)
+        if weather_data and weather_data.get("stale"):
+            minute = int(time.time() // 60)
+            if minute != age_minute:
+                age_minute, dirty = minute, True
+        prof.lap("fetch")
 
-        # Loading screen
-        if loading:
-            draw_loading(stdscr, frame)
-            stdscr.refresh()
-            frame += 1
-            time.sleep(FRAME_TIME)
+        # Loading screen (first launch for this location, nothing cached)
+        if weather_data is None:
+            if sched.render_due:
+                # The splash is centred in the scene region; panel and status stay blank
+                for region in regions.all():
+                    region.fb.erase()
+                    region.dirty = True
+                regions.panel_key = None
+                draw_loading(regions.scene.fb, clock.t)
+                prof.lap("scene")
+                prof.count_calls(regions.flush())
+                prof.lap("refresh")
+                startup.mark_once("first frame (loading screen)")
+                frame += 1
+            sched.end_frame()
+            prof.end_frame()
             continue
 
-        # Determine weather type
+        # Determine weather type (of the scrubbed-to forecast slot, if any)
+        shown = forecast_view(weather_data, ahead)
         wtype = (
-            weather_data.get("type", "sun")
-            if weather_data and "error" not in weather_data
+            shown.get("type", "sun")
+            if shown and "error" not in shown
             else "sun"
         )
 
-        # Draw
-        _draw_scene(stdscr, wtype, particles, frame, weather_data)
-
-        house_x = (w - 22) // 2
-        house_y = h - 14 - len(HOUSE) + 2
-        draw_house(stdscr, max(1, house_y), max(0, house_x), wtype)
+        # Advance the world in fixed real-time steps, however often we draw
+        for _ in range(steps):
+            update_particles(particles, wtype)
+        prof.lap("update")
 
-        draw_info_panel(stdscr, weather_data, frame)
-        draw_status_bar(stdscr, frame)
+        # Draw: cached static layer, moving things, then the house on top.
+        # Frames behind schedule skip this; so do frames where nothing moved.
+        drawn = sched.render_due and bool(steps or dirty)
+        if drawn:
+            dirty = False
+            render_frame(regions, layers, wtype, particles, clock.t, shown, frame, prof,
+                         governor.level, (shown_gen, ahead))
 
-        stdscr.refresh()
+            # Only changed cells of changed windows reach the terminal, in one update
+            prof.count_calls(regions.flush())
+            prof.lap("refresh")
+            startup.mark_once("first weather frame")
+            frame += 1
 
-        # Tick
-        _update_particles(particles, wtype)
-        frame += 1
-        time.sleep(FRAME_TIME)
+        sched.end_frame()
+        if drawn and governor.observe(sched.busy):
+            # Too slow (or plenty of headroom): change the amount of detail
+            resize_particles(particles, w, h, governor.level.particles)
+            dirty = True
+        prof.end_frame()
@@ -0,0 +1,96 @@
+# Render benchmarks.
+#
+# Runs every scene headlessly for a fixed number of frames at a few terminal
+# sizes, with seeded randomness, and reports frame rate, frame-time
+# percentiles and per-phase cost as JSON — so render regressions show up as
+# numbers between releases instead of as a "feels slower" pane.
+
+from __future__ import annotations
+import platform
+import time
+
+import particles as particles_mod
+from app import render_frame
+from layers import LayerCache
+from particles import spawn_particles, update_particles
+from regions import Regions
+from scheduler import SIM_DT
+from sprites import compile_all
+from weather import make_demo_data
+
+SCENES = ["sun", "rain", "snow", "cloud", "thunder", "fog"]
+SIZES  = [(80, 24), (200, 60), (400, 120)]   # (w, h)
+
+DEFAULT_FRAMES = 200
+DEFAULT_SEED   = 1234
+
+
+def _percentile(sorted_ms: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_ms:
+        return 0.0
+    k = min(len(sorted_ms) - 1, max(0, round(p / 100 * len(sorted_ms)) - 1))
+    return sorted_ms[k]
+
+
+def bench_scene(wtype: str, w: int, h: int, frames: int, seed: int) -> dict:
+    """Run one scene at one size; one simulation step per frame, as in the live loop at 20 FPS."""
+    particles_mod.seed(seed)
+    regions   = Regions(h, w, headless=True)
+    layers    = LayerCache()
+    particles = spawn_particles(w, h)
+    data      = make_demo_data(wtype)
+    clock     = time.perf_counter
+
+    phases = {"update": 0.0, "draw": 0.0, "flush": 0.0}
+    totals = []
+    calls  = 0
+    cells  = 0
+
+    for frame in range(frames):
+        t0 = clock()
+        update_particles(particles, wtype)
+        t1 = clock()
+        render_frame(regions, layers, wtype, particles, frame * SIM_DT, data, frame)
+        t2 = clock()
+        for region in regions.all():
+            region.win.reset_counters()
+        regions.flush()
+        t3 = clock()
+
+        phases["update"] += t1 - t0
+        phases["draw"]   += t2 - t1
+        phases["flush"]  += t3 - t2
+        totals.append((t3 - t0) * 1000)
+        calls += sum(region.win.calls for region in regions.all())
+        cells += sum(region.win.cells_written for region in regions.all())
+
+    elapsed = sum(totals) / 1000
+    totals.sort()
+    return {
+        "scene":      wtype,
+        "size":       f"{w}x{h}",
+        "frames":     frames,
+        "fps":        round(frames / elapsed, 1) if elapsed else None,
+        "frame_ms":   {
+            "p50":  round(_percentile(totals, 50), 3),
+            "p99":  round(_percentile(totals, 99), 3),
+            "mean": round(elapsed * 1000 / frames, 3),
+        },
+        "phase_ms":   {name: round(secs * 1000 / frames, 3) for name, secs in phases.items()},
+        "calls_per_frame": round(calls / frames, 1),
+        "cells_per_frame": round(cells / frames, 1),
+    }
+
+
+def run_bench(frames: int = DEFAULT_FRAMES, seed: int = DEFAULT_SEED,
+              scenes: list[str] = SCENES, sizes: list[tuple[int, int]] = SIZES) -> dict:
+    """Benchmark every scene × size and return a JSON-ready report."""
+    compile_all()
+    return {
+        "python":  platform.python_version(),
+        "numpy":   particles_mod.NUMPY_OK,
+        "frames":  frames,
+        "seed":    seed,
+        "results": [bench_scene(s, w, h, frames, seed) for s in scenes for w, h in sizes],
+    }
@@ -0,0 +1,164 @@
+# On-disk weather cache.
+#
+# Normalized results from fetch_weather() are stored per location in one small
+# JSON file, so a new pane can draw the last known weather immediately and a
+# refresh within the TTL never leaves the machine.
+
+from __future__ import annotations
+import json
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_TTL  = 600     # seconds a cached result counts as fresh
+LOCATION_TTL = 86400   # the IP -> city lookup barely ever changes
+
+# Lean (custom-format) results lack fields a full one has, so they get their own entries
+LEAN_SUFFIX = "|lean"
+
+_VERSION = 2     # 2: lean results no longer share the full result's entry
+
+
+def default_ttl(refresh: float) -> float:
+    """TTL when none was given: DEFAULT_TTL, or one refresh interval if that's shorter."""
+    return min(DEFAULT_TTL, refresh) if refresh > 0 else DEFAULT_TTL
+
+
+def default_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "nimbus", "weather.json")
+
+
+def location_key(city: str | None) -> str:
+    """Cache key for a location query; auto-detected location shares one slot."""
+    return " ".join(city.lower().split()) if city and city.strip() else "@auto"
+
+
+class WeatherCache:
+    """
+    JSON-file cache of weather dicts keyed by location. Safe to share between
+    threads; writes are atomic (temp file + rename) so concurrent panes never
+    read a half-written file.
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = DEFAULT_TTL):
+        self.path   = path or default_cache_path()
+        self.ttl    = ttl
+        self._lock  = threading.Lock()
+        self._doc: dict | None = None
+        self._stamp = None           # (inode, mtime) of the file _doc was read from
+
+    def _load(self) -> dict:
+        """The parsed file; re-read whenever another pane (or thread) has replaced it."""
+        try:
+            st    = os.stat(self.path)
+            stamp = (st.st_ino, st.st_mtime_ns)
+        except OSError:
+            stamp = None
+        if self._doc is None or stamp != self._stamp:
+            self._stamp = stamp
+            try:
+                with open(self.path) as fh:
+                    raw = json.load(fh)
+                if raw.get("version") != _VERSION:
+                    raise ValueError("cache format changed")
+                self._doc = {"entries": raw.get("entries", {}), "location": raw.get("location")}
+            except (OSError, ValueError, AttributeError):
+                self._doc = {"entries": {}, "location": None}
+        return self._doc
+
+    def key_for(self, city: str | None, lean: bool = False) -> str:
+        """
+        Cache key for a query; auto-detect resolves through the cached location
+        when known. Lean and full results are kept apart.
+        """
+        return location_key(city or self.location()) + (LEAN_SUFFIX if lean else "")
+
+    def lookup(self, key: str) -> tuple[dict, float] | None:
+        """(data, age in seconds) for the newest entry under `key`, however old."""
+        with self._lock:
+            entry = self._load()["entries"].get(key)
+        if not entry:
+            return None
+        return entry["data"], max(0.0, time.time() - entry["fetched_at"])
+
+    def fresh(self, key: str) -> dict | None:
+        """The cached data if it's younger than the TTL, else None."""
+        hit = self.lookup(key)
+        if hit and hit[1] < self.ttl:
+            return hit[0]
+        return None
+
+    def put(self, key: str, data: dict):
+        """Store a successful result (errors are never cached), with any HTTP validators it carries."""
+        if "error" in data:
+            return
+        validators = data.get("validators")
+        data  = {k: v for k, v in data.items() if k not in ("stale", "fetched_at", "validators")}
+        entry = {"fetched_at": time.time(), "data": data}
+        if validators:
+            entry["validators"] = validators
+        with self._lock:
+            self._doc = None                 # re-read: other panes may have written since
+            doc       = self._load()
+            doc["entries"][key] = entry
+            self._write(doc)
+
+    def validators(self, key: str) -> dict | None:
+        """ETag / Last-Modified stored with the entry under `key`, for a conditional refresh."""
+        with self._lock:
+            entry = self._load()["entries"].get(key)
+        return entry.get("validators") if entry else None
+
+    def touch(self, key: str) -> dict | None:
+        """The upstream confirmed the entry is unchanged: restart its age and return its data."""
+        with self._lock:
+            self._doc = None
+            entry     = self._load()["entries"].get(key)
+            if not entry:
+                return None
+            entry["fetched_at"] = time.time()
+            self._write(self._doc)
+        return entry["data"]
+
+    def location(self) -> str | None:
+        """The geolocated city if it was resolved within LOCATION_TTL."""
+        with self._lock:
+            loc = self._load()["location"]
+        if loc and time.time() - loc["resolved_at"] < LOCATION_TTL:
+            return loc["value"]
+        return None
+
+    def put_location(self, value: str):
+        with self._lock:
+            self._doc = None
+            doc       = self._load()
+            doc["location"] = {"value": value, "resolved_at": time.time()}
+            self._write(doc)
+
+    def _write(self, doc: dict):
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".weather-", suffix=".json")
+            with os.fdopen(fd, "w") as fh:
+                json.dump({"version": _VERSION, **doc}, fh)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # a read-only or full disk just means no cache
+
+
+def last_known(cache: WeatherCache | None, city: str | None,
+               lean: bool = False) -> tuple[dict | None, float]:
+    """Last known weather for a first frame (as-is within the TTL, else marked stale) and its age."""
+    hit = cache.lookup(cache.key_for(city, lean)) if cache else None
+    if not hit:
+        return None, 0.0
+    data, age = hit
+    return (data if age < cache.ttl else mark_stale(data, age)), age
+
+
+def mark_stale(data: dict, age: float) -> dict:
+    """Copy of cached data flagged for display as 'last known' while a refresh runs."""
+    return {**data, "stale": True, "fetched_at": time.time() - age}
@@ -11,40 +11,65 @@
 
 import curses
 
+# Colors beyond the basic eight, by color number -> (r, g, b) in 0-255
+GRAY = 16
+EXTENDED_COLORS = {
+    GRAY: (153, 153, 153),
+}
+
+# Pair index -> (foreground, background); -1 is the terminal's default.
+# setup_colors() registers these with curses; the ANSI backend reads them directly.
+PAIRS = {
+    1:  (curses.COLOR_BLUE,    -1),                                         # rain
+    2:  (curses.COLOR_CYAN,    -1),                                         # ripples
+    3:  (curses.COLOR_WHITE,   -1),                                         # general
+    4:  (curses.COLOR_YELLOW,  -1),                                         # sun / flash
+    5:  (curses.COLOR_GREEN,   -1),                                         # ground
+    6:  (curses.COLOR_MAGENTA, -1),                                         # reserved
+    7:  (curses.COLOR_RED,     -1),                                         # errors
+    12: (curses.COLOR_YELLOW,  curses.COLOR_BLACK),                         # status bar
+    13: (GRAY,                 -1),                                         # clouds / borders
+}
+
 
 def setup_colors():
     curses.start_color()
     curses.use_default_colors()
 
-    curses.init_pair(1,  curses.COLOR_BLUE,    -1)                          # rain
-    curses.init_pair(2,  curses.COLOR_CYAN,    -1)                          # ripples
-    curses.init_pair(3,  curses.COLOR_WHITE,   -1)                          # general
-    curses.init_pair(4,  curses.COLOR_YELLOW,  -1)                          # sun / flash
-    curses.init_pair(5,  curses.COLOR_GREEN,   -1)                          # ground
-    curses.init_pair(6,  curses.COLOR_MAGENTA, -1)                          # reserved
-    curses.init_pair(7,  curses.COLOR_RED,     -1)                          # errors
-    curses.init_pair(12, curses.COLOR_YELLOW,  curses.COLOR_BLACK)          # status bar
+    for pair, (fg, bg) in PAIRS.items():
+        if fg not in EXTENDED_COLORS:
+            curses.init_pair(pair, fg, bg)
+            continue
+        # Extended color if the terminal supports it, fall back to WHITE
+        r, g, b = (round(c * 1000 / 255) for c in EXTENDED_COLORS[fg])
+        try:
+            curses.init_color(fg, r, g, b)
+            curses.init_pair(pair, fg, bg)
+        except Exception:
+            curses.init_pair(pair, curses.COLOR_WHITE, bg)
 
-    # Gray — use extended color if the terminal supports it, fall back to WHITE
-    try:
-        curses.init_color(16, 600, 600, 600)
-        curses.init_pair(13, 16, -1)
-    except Exception:
-        curses.init_pair(13, curses.COLOR_WHITE, -1)
+
+def color_pair(n: int) -> int:
+    """
+    The attribute curses.color_pair(n) returns (ncurses' COLOR_PAIR macro),
+    computed without needing an initialized screen — so headless renderers
+    and benchmarks produce exactly the attributes the real terminal gets.
+    """
+    return (n << 8) & curses.A_COLOR
 
 
 # Named color helpers
-# Using lambdas so they're evaluated lazily (curses must be initialized first).
-
-def rain_color():    return curses.color_pair(1)
-def ripple_color():  return curses.color_pair(2)
-def general_color(): return curses.color_pair(3)
-def sun_color():     return curses.color_pair(4) | curses.A_BOLD
-def ground_color():  return curses.color_pair(5)
-def error_color():   return curses.color_pair(7)
-def status_color():  return curses.color_pair(12)
-def dim_color():     return curses.color_pair(13)
-def house_color():   return curses.color_pair(3) | curses.A_BOLD
-def title_color():   return curses.color_pair(4) | curses.A_BOLD
-def flash_color():   return curses.color_pair(4) | curses.A_BOLD
-def snow_color():    return curses.color_pair(3) | curses.A_BOLD
\ No newline at end of file
+
+def rain_color():    return color_pair(1)
+def ripple_color():  return color_pair(2)
+def general_color(): return color_pair(3)
+def sun_color():     return color_pair(4) | curses.A_BOLD
+def ground_color():  return color_pair(5)
+def error_color():   return color_pair(7)
+def status_color():  return color_pair(12)
+def dim_color():     return color_pair(13)
+def house_color():   return color_pair(3) | curses.A_BOLD
+def title_color():   return color_pair(4) | curses.A_BOLD
+def flash_color():   return color_pair(4) | curses.A_BOLD
+def snow_color():    return color_pair(3) | curses.A_BOLD
+def window_color():  return color_pair(4)
\ No newline at end of file
@@ -0,0 +1,331 @@
+# Shared weather daemon.
+#
+# `nimbus --serve` runs one process per host that owns fetching, caching and
+# refreshing, and pushes normalized weather dicts to every connected client
+# over a Unix socket — so a jump host with dozens of panes makes one upstream
+# request per city, not one per terminal.
+#
+# Protocol: newline-delimited JSON in both directions.
+#   client -> daemon   {"op": "watch",   "city": "London", "lean": false}   start receiving updates
+#                      {"op": "refresh", "city": "London", "lean": false}   ask for a refresh now
+#   daemon -> client   {"key": "london", "data": {...}}                     pushed on every new result
+#
+# Lean and full results are fetched, refreshed and pushed separately, so a
+# client always gets the format it asked for ("lean" defaults to --lean).
+#
+# DaemonClient has the same request()/poll()/pending() surface as
+# FetchCoordinator, and quietly turns into one if the daemon goes away.
+
+from __future__ import annotations
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+
+from cache import WeatherCache, default_ttl, last_known, location_key
+from fetcher import FetchCoordinator, RefreshSchedule, DEFAULT_REFRESH, FETCH_WORKERS
+
+# How often the daemon checks for finished fetches and due refreshes
+POLL_INTERVAL = 0.25
+
+# A client this many bytes behind on pushes has stalled and is dropped
+MAX_BACKLOG = 1 << 20
+
+# Upstream requests the daemon runs at once, across all cities
+SERVER_WORKERS = 4
+
+
+def default_socket_path() -> str:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "nimbus.sock")
+    return os.path.join("/tmp", f"nimbus-{os.getuid()}.sock")
+
+
+def _encode(msg: dict) -> bytes:
+    return (json.dumps(msg) + "\n").encode()
+
+
+# Server
+class _Client:
+    __slots__ = ("sock", "buf", "out", "keys")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buf  = b""              # partial incoming line
+        self.out  = bytearray()      # pushes the socket hasn't taken yet
+        self.keys: set[tuple[str, bool]] = set()
+
+
+class _Watch:
+    __slots__ = ("city", "lean", "data", "gen", "schedule", "clients")
+
+    def __init__(self, city: str | None, lean: bool, data: dict | None, schedule: RefreshSchedule):
+        self.city     = city
+        self.lean     = lean
+        self.data     = data
+        self.gen      = 0
+        self.schedule = schedule
+        self.clients: set[_Client] = set()
+
+
+class WeatherServer:
+    """Single-threaded select loop; fetches run on the coordinator's worker threads."""
+
+    def __init__(self, path: str, cache: WeatherCache | None, refresh: float = DEFAULT_REFRESH,
+                 lean: bool = False):
+        self.path     = path
+        self.cache    = cache
+        self.refresh  = refresh
+        self.lean     = lean           # for clients that don't say
+        self.fetchers = {fmt: FetchCoordinator(cache, workers=SERVER_WORKERS, lean=fmt)
+                         for fmt in (False, True)}
+        self._sel     = selectors.DefaultSelector()
+        self._watches: dict[tuple[str, bool], _Watch] = {}   # by (location key, lean)
+
+    def serve_forever(self):
+        listener = self._listen()
+        try:
+            while True:
+                for key, events in self._sel.select(timeout=POLL_INTERVAL):
+                    if key.fileobj is listener:
+                        self._accept(listener)
+                        continue
+                    if events & selectors.EVENT_WRITE:
+                        self._flush(key.data)
+                    if events & selectors.EVENT_READ and key.data.sock.fileno() != -1:
+                        self._read(key.data)
+                self._tick()
+        finally:
+            listener.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _listen(self) -> socket.socket:
+        if os.path.exists(self.path):
+            probe = _probe(self.path)
+            if probe:
+                probe.close()
+                raise RuntimeError(f"a Nimbus daemon is already listening on {self.path}")
+            os.unlink(self.path)       # left behind by a daemon that died
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        listener.listen()
+        listener.setblocking(False)
+        self._sel.register(listener, selectors.EVENT_READ)
+        return listener
+
+    def _accept(self, listener: socket.socket):
+        try:
+            sock, _ = listener.accept()
+        except OSError:
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        self._sel.register(sock, selectors.EVENT_READ, client)
+
+    def _read(self, client: _Client):
+        try:
+            chunk = client.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._drop(client)
+            return
+        client.buf += chunk
+        *lines, client.buf = client.buf.split(b"\n")
+        for line in lines:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            lean = bool(msg.get("lean", self.lean))
+            if msg.get("op") == "watch":
+                self._watch(client, msg.get("city"), lean)
+            elif msg.get("op") == "refresh":
+                self.fetchers[lean].request(msg.get("city"))
+
+    def _watch(self, client: _Client, city: str | None, lean: bool):
+        key   = location_key(city)
+        watch = self._watches.get((key, lean))
+        if watch is None:
+            data, age = last_known(self.cache, city, lean)
+            watch     = _Watch(city, lean, data, RefreshSchedule(self.refresh, age))
+            self._watches[key, lean] = watch
+            if data is None or "stale" in data:
+                self.fetchers[lean].request(city)
+                watch.schedule.started()
+        watch.clients.add(client)
+        client.keys.add((key, lean))
+        if watch.data is not None:
+            self._send(client, key, watch.data)
+
+    def _drop(self, client: _Client):
+        if client.sock.fileno() == -1:
+            return                     # already dropped
+        self._sel.unregister(client.sock)
+        client.sock.close()
+        for wkey in client.keys:
+            watch = self._watches.get(wkey)
+            if watch:
+                watch.clients.discard(client)
+                if not watch.clients:
+                    # Nobody is looking: stop refreshing it
+                    self.fetchers[watch.lean].cancel(watch.city)
+                    del self._watches[wkey]
+
+    def _send(self, client: _Client, key: str, data: dict):
+        """Queue a push; a client that isn't reading never holds up the others."""
+        client.out += _encode({"key": key, "data": data})
+        if len(client.out) > MAX_BACKLOG:
+            self._drop(client)
+            return
+        self._flush(client)
+
+    def _flush(self, client: _Client):
+        """Write what the socket takes now; wait for EVENT_WRITE for the rest."""
+        try:
+            sent = client.sock.send(client.out)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(client)
+            return
+        del client.out[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.out else 0)
+        if self._sel.get_key(client.sock).events != events:
+            self._sel.modify(client.sock, events, client)
+
+    def _tick(self):
+        for (key, lean), watch in list(self._watches.items()):
+            fetcher = self.fetchers[lean]
+            latest  = fetcher.poll(watch.city)
+            if latest and latest[0] != watch.gen:
+                watch.gen, watch.data = latest
+                watch.schedule.done(watch.data)
+                for client in list(watch.clients):
+                    self._send(client, key, watch.data)
+            elif watch.schedule.due() and not fetcher.pending(watch.city):
+                fetcher.request(watch.city)
+                watch.schedule.started()
+
+
+def serve(path: str | None = None, cache_ttl: float | None = None,
+          use_cache: bool = True, refresh: float = DEFAULT_REFRESH, lean: bool = False):
+    """Run the daemon in the foreground until interrupted."""
+    if cache_ttl is None:
+        cache_ttl = default_ttl(refresh)
+    cache = WeatherCache(ttl=cache_ttl) if use_cache else None
+    # Let `kill` clean up the socket like Ctrl-C does
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    WeatherServer(path or default_socket_path(), cache, refresh, lean).serve_forever()
+
+
+# Client
+def _probe(path: str) -> socket.socket | None:
+    """A connected socket if a daemon answers at `path`, else None."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+class DaemonClient:
+    """
+    Weather from a running daemon, with FetchCoordinator's request/poll/pending
+    interface. Results arrive on a reader thread; if the connection drops, the
+    client switches to fetching directly and carries on.
+    """
+
+    def __init__(self, sock: socket.socket, cache: WeatherCache | None = None, lean: bool = False,
+                 workers: int = FETCH_WORKERS):
+        self.cache     = cache
+        self.lean      = lean
+        self.workers   = workers                    # for the direct fallback
+        self._sock     = sock
+        self._lock     = threading.Lock()
+        self._gen      = 0
+        self._results: dict[str, tuple[int, dict]] = {}
+        self._cities:  dict[str, str | None] = {}   # watched keys -> the city as given
+        self._waiting: set[str] = set()
+        self._direct: FetchCoordinator | None = None
+        threading.Thread(target=self._listen, name="nimbus-daemon", daemon=True).start()
+
+    @property
+    def connected(self) -> bool:
+        return self._direct is None
+
+    def request(self, city: str | None, force: bool = False) -> int:
+        if self._direct:
+            return self._direct.request(city, force)
+        key = location_key(city)
+        with self._lock:
+            op = "refresh" if key in self._cities else "watch"
+            self._cities[key] = city
+            self._waiting.add(key)
+        try:
+            self._sock.sendall(_encode({"op": op, "city": city, "lean": self.lean}))
+        except OSError:
+            self._go_direct()
+        return self._gen
+
+    def pending(self, city: str | None) -> bool:
+        if self._direct:
+            return self._direct.pending(city)
+        return location_key(city) in self._waiting
+
+    def poll(self, city: str | None) -> tuple[int, dict] | None:
+        if self._direct:
+            latest = self._direct.poll(city)
+            if latest:
+                # Continue the generation count from where the daemon left off
+                return self._gen + latest[0], latest[1]
+        return self._results.get(location_key(city))
+
+    def _listen(self):
+        try:
+            with self._sock.makefile("rb") as stream:
+                for line in stream:
+                    msg = json.loads(line)
+                    with self._lock:
+                        self._gen += 1
+                        self._results[msg["key"]] = (self._gen, msg["data"])
+                        self._waiting.discard(msg["key"])
+        except (OSError, ValueError, KeyError):
+            pass
+        self._go_direct()
+
+    def _go_direct(self):
+        with self._lock:
+            if self._direct:
+                return
+            self._direct = FetchCoordinator(self.cache, workers=self.workers, lean=self.lean)
+            cities       = list(self._cities.values())
+        for city in cities:
+            self._direct.request(city)
+
+
+def connect(path: str | None = None, cache: WeatherCache | None = None,
+            lean: bool = False, workers: int = FETCH_WORKERS) -> DaemonClient | None:
+    """A client for the daemon at `path` (default socket), or None if none is running."""
+    sock = _probe(path or default_socket_path())
+    return DaemonClient(sock, cache, lean, workers) if sock else None
+
+
+def open_fetcher(cache: WeatherCache | None, demo_mode: str | None = None,
+                 socket_path: str | None = None, use_daemon: bool = True,
+                 workers: int = FETCH_WORKERS, lean: bool = False) -> DaemonClient | FetchCoordinator:
+    """The daemon if one is running (never in demo mode), else direct fetching."""
+    client = connect(socket_path, cache, lean, workers) if use_daemon and not demo_mode else None
+    return client or FetchCoordinator(cache, demo_mode, workers=workers, lean=lean)
@@ -0,0 +1,281 @@
+# Multi-city dashboard.
+#
+# `nimbus London Tokyo Bengaluru ...` tiles the screen with one mini scene per
+# city, each with a short caption. Tiles showing the same weather share
+# everything but that caption: one static layer and one particle set per
+# weather type at the current tile size, animated and composed once per frame
+# and then blitted into every tile that needs it — so drawing cost grows with
+# the number of distinct weather types on screen, not with the number of cities.
+
+from __future__ import annotations
+import curses
+
+import startup
+from ansi import AnsiScreen
+from app import FPS
+from cache import WeatherCache, default_ttl, last_known
+from colors import setup_colors, error_color
+from daemon import DaemonClient, open_fetcher
+from fetcher import RefreshSchedule, DEFAULT_REFRESH
+from framebuffer import FrameBuffer
+from particles import spawn_particles, resize_particles, update_particles
+from profiler import FrameProfiler
+from quality import Quality, QualityGovernor, HIGH
+from scenes import draw_scene, draw_static_scene
+from scheduler import FrameScheduler, SimClock
+from sprites import compile_all
+from ui import draw_status_bar, draw_hud, draw_tile_info, KEY_HELP
+
+# Rows under each tile's scene: the caption plus one blank spacer row
+TILE_INFO_ROWS = 3
+TILE_GAP       = 1
+
+# Smallest tile worth drawing
+MIN_TILE_W = 24
+MIN_TILE_H = 9
+
+# Concurrent fetches, however many cities are on screen
+DASHBOARD_WORKERS = 4
+
+
+def tile_grid(n: int, h: int, w: int) -> tuple[int, int, int, int] | None:
+    """
+    (rows, cols, tile_h, tile_w) for n tiles on an h × w screen (the last row
+    is the status bar), or None if the tiles would be too small. Picks the
+    column count that keeps tiles closest to a landscape 3:1 cell shape.
+    """
+    best = None
+    for cols in range(1, n + 1):
+        rows   = -(-n // cols)
+        tile_w = w // cols
+        tile_h = (h - 1) // rows
+        if tile_w < MIN_TILE_W or tile_h < MIN_TILE_H:
+            continue
+        score = min(tile_w / 3, tile_h)
+        if best is None or score > best[0]:
+            best = (score, rows, cols, tile_h, tile_w)
+    return best[1:] if best else None
+
+
+class TileScenes:
+    """
+    The animated scene for every weather type on screen at one tile size.
+    Each type gets one cached static layer and one particle set, however many
+    tiles show it.
+    """
+
+    def __init__(self, level: Quality = HIGH):
+        self.size  = (0, 0)
+        self.level = level
+        self._particles: dict[str, dict]        = {}
+        self._bases:     dict[str, FrameBuffer] = {}
+        self._frames:    dict[str, FrameBuffer] = {}
+
+    def resize(self, h: int, w: int):
+        """Set the scene size (sky + ground line); particles are refitted, layers rebuilt lazily."""
+        if (h, w) != self.size:
+            self.size = (h, w)
+            for particles in self._particles.values():
+                resize_particles(particles, w, h, self.level.particles)
+            self._bases.clear()
+            self._frames.clear()
+
+    def set_level(self, level: Quality):
+        """Switch the level of detail; particle sets are refitted to it in place."""
+        self.level = level
+        h, w       = self.size
+        for particles in self._particles.values():
+            resize_particles(particles, w, h, level.particles)
+
+    def _particles_for(self, wtype: str) -> dict:
+        particles = self._particles.get(wtype)
+        if particles is None:
+            h, w      = self.size
+            particles = self._particles[wtype] = spawn_particles(w, h, self.level.particles)
+        return particles
+
+    def step(self, wtypes):
+        """Advance the particles of every weather type on screen by one simulation step."""
+        for wtype in wtypes:
+            update_particles(self._particles_for(wtype), wtype)
+
+    def compose(self, wtype: str, t: float) -> FrameBuffer:
+        """This frame's picture for `wtype`: its static layer with the moving parts on top."""
+        h, w = self.size
+        base = self._bases.get(wtype)
+        if base is None:
+            base = self._bases[wtype] = FrameBuffer(h, w)
+            draw_static_scene(base, wtype, sky_height=h - 1)
+        frame = self._frames.get(wtype)
+        if frame is None:
+            frame = self._frames[wtype] = FrameBuffer(h, w)
+        frame.blit(base)
+        draw_scene(frame, wtype, self._particles_for(wtype), t, None, h - 1, self.level)
+        return frame
+
+
+class _Tile:
+    __slots__ = ("city", "data", "gen", "schedule")
+
+    def __init__(self, city: str, data: dict | None, schedule: RefreshSchedule):
+        self.city     = city
+        self.data     = data
+        self.gen      = 0
+        self.schedule = schedule
+
+    @property
+    def wtype(self) -> str:
+        if self.data and "error" not in self.data:
+            return self.data.get("type", "sun")
+        return "sun"
+
+
+def run_dashboard(stdscr, cities: list[str], demo_mode: str | None,
+                  fps: int = FPS, adaptive: bool = False,
+                  profile_out: str | None = None, trace_out: str | None = None,
+                  cache_ttl: float | None = None, use_cache: bool = True,
+                  refresh: float = DEFAULT_REFRESH,
+                  socket_path: str | None = None, use_daemon: bool = True,
+                  lean: bool = True, quality: str = "auto"):
+    """
+    Dashboard curses loop — called via curses.wrapper() with two or more
+    cities. Tiles never show the forecast or visibility, so by default they
+    are fetched lean.
+    """
+    startup.mark("curses ready")
+    if demo_mode:
+        refresh = 0
+    if cache_ttl is None:
+        cache_ttl = default_ttl(refresh)
+    prof    = FrameProfiler(enabled=bool(profile_out), trace=bool(trace_out))
+    cache   = WeatherCache(ttl=cache_ttl) if use_cache and not demo_mode else None
+    fetcher = open_fetcher(cache, demo_mode, socket_path, use_daemon,
+                           workers=min(len(cities), DASHBOARD_WORKERS), lean=lean)
+    try:
+        _loop(stdscr, cities, fps, adaptive, prof, cache, fetcher, refresh, QualityGovernor(quality))
+    finally:
+        prof.dump(profile_out, trace_out)
+
+
+def _loop(stdscr, cities: list[str], fps: int, adaptive: bool, prof: FrameProfiler,
+          cache: WeatherCache | None, fetcher, refresh: float, governor: QualityGovernor):
+    if not isinstance(stdscr, AnsiScreen):
+        setup_colors()
+        curses.curs_set(0)
+    compile_all()
+
+    h, w    = stdscr.getmaxyx()
+    fb      = FrameBuffer(h, w)
+    sched   = FrameScheduler(fps, adaptive)
+    clock   = SimClock()
+    scenes  = TileScenes(governor.level)
+    frame   = 0
+    dirty   = True
+
+    # Cached weather first; cities without it are fetched now (the worker pool
+    # bounds how many at once). Automatic refreshes are spread evenly across
+    # one interval so the whole wall never refreshes in the same second.
+    # With a daemon, it does the refreshing and we only subscribe.
+    live  = isinstance(fetcher, DaemonClient)
+    every = 0 if live else refresh
+    tiles = []
+    for i, city in enumerate(cities):
+        data, age = last_known(cache, city, fetcher.lean)
+        tile      = _Tile(city, data, RefreshSchedule(every, age, offset=every * i / len(cities)))
+        if live or data is None or "stale" in data:
+            fetcher.request(city, force=True)
+            tile.schedule.started()
+        tiles.append(tile)
+
+    while True:
+        key = sched.wait(stdscr)
+        prof.lap("sleep")
+        if key in (ord("q"), ord("Q"), 27):
+            break
+        if key in (ord("r"), ord("R")):
+            for tile in tiles:
+                fetcher.request(tile.city)
+                tile.schedule.started()
+        if key in (ord("p"), ord("P")):
+            prof.toggle_hud()
+            dirty = True
+        prof.lap("input")
+        if key != -1:
+            continue
+
+        sched.begin_frame()
+        steps = clock.advance()
+        h, w  = stdscr.getmaxyx()
+        if (h, w) != fb.getmaxyx():
+            fb.resize(h, w)
+            stdscr.clear()
+            dirty = True
+
+        grid = tile_grid(len(tiles), h, w)
+        if grid is None:
+            stdscr.clear()
+            fb.invalidate()
+            dirty = True
+            try:
+                stdscr.addstr(0, 0, f"Terminal too small for {len(tiles)} cities — got {w}×{h}", error_color())
+            except curses.error:
+                pass
+            stdscr.refresh()
+            sched.end_frame()
+            prof.end_frame()
+            continue
+        _, cols, tile_h, tile_w = grid
+        scene_h = tile_h - TILE_INFO_ROWS - TILE_GAP
+        scenes.resize(scene_h, tile_w)
+
+        # A daemon that went away leaves the refreshing to us, spread out as above
+        if live and not fetcher.connected:
+            live = False
+            for i, tile in enumerate(tiles):
+                tile.schedule.set_interval(refresh, offset=refresh * i / len(tiles))
+
+        # Finished fetches, then each city's next automatic refresh
+        for tile in tiles:
+            latest = fetcher.poll(tile.city)
+            if latest and latest[0] != tile.gen:
+                tile.gen, tile.data = latest
+                tile.schedule.done(tile.data)
+                dirty = True
+            elif tile.schedule.due() and not fetcher.pending(tile.city):
+                fetcher.request(tile.city)
+                tile.schedule.started()
+        prof.lap("fetch")
+
+        wtypes = {tile.wtype for tile in tiles}
+        for _ in range(steps):
+            scenes.step(wtypes)
+        prof.lap("update")
+
+        drawn = sched.render_due and bool(steps or dirty)
+        if drawn:
+            dirty    = False
+            composed = {wtype: scenes.compose(wtype, clock.t) for wtype in wtypes}
+            prof.lap("scene")
+
+            fb.erase()
+            for i, tile in enumerate(tiles):
+                row, col = divmod(i, cols)
+                y, x     = row * tile_h, col * tile_w
+                fb.blit_at(composed[tile.wtype], y, x)
+                draw_tile_info(fb, y + scene_h, x, tile_w - 1, tile.city, tile.data, clock.t)
+            draw_status_bar(fb, frame, governor.level.name, KEY_HELP)
+            if prof.hud:
+                draw_hud(fb, prof.hud_lines())
+            prof.lap("info")
+
+            prof.count_calls(fb.flush(stdscr))
+            stdscr.refresh()
+            prof.lap("refresh")
+            startup.mark_once("first frame")
+            frame += 1
+
+        sched.end_frame()
+        if drawn and governor.observe(sched.busy):
+            scenes.set_level(governor.level)
+            dirty = True
+        prof.end_frame()
@@ -0,0 +1,221 @@
+# Fetch coordination.
+#
+# All weather fetches go through one FetchCoordinator: a couple of daemon
+# worker threads, at most one request queued or in flight per location, and
+# a generation number per request so results that were cancelled, superseded
+# or timed out are dropped instead of overwriting newer ones. The render loop
+# only ever reads the published results dict — no locks on that path.
+#
+# RefreshSchedule decides when a pane should ask again: a jittered interval
+# so many always-on panes drift apart instead of hitting the backend in step,
+# and exponential backoff while the upstream keeps failing.
+
+from __future__ import annotations
+import queue
+import random
+import threading
+import time
+
+from cache import WeatherCache, location_key, mark_stale
+from weather import fetch_weather, make_demo_data
+
+FETCH_TIMEOUT = 10.0   # seconds per request, geolocation + weather together
+FETCH_WORKERS = 2      # a hung request must not block everyone else
+
+DEFAULT_REFRESH = 600.0  # seconds between automatic refreshes
+REFRESH_JITTER  = 0.2    # each interval is stretched by up to this fraction at random
+RETRY_BASE      = 30.0   # first retry after a failed refresh, doubling each time
+RETRY_MAX       = 1800.0
+
+
+class _Job:
+    __slots__ = ("key", "city", "force", "gen", "queued")
+
+    def __init__(self, key: str, city: str | None, force: bool, gen: int):
+        self.key    = key
+        self.city   = city
+        self.force  = force
+        self.gen    = gen
+        self.queued = time.monotonic()   # timeouts count from here, not from when a worker got to it
+
+
+def fetch_with_cache(city: str | None, cache: WeatherCache | None, force: bool = False,
+                     timeout: float = FETCH_TIMEOUT, lean: bool = False) -> dict:
+    """
+    One fetch, cache-aware: a cached result younger than the TTL is served
+    unless `force`; otherwise the request is conditional on the cached entry's
+    validators, so an unchanged upstream costs a 304 instead of a full body.
+    A failed fetch falls back to the last known result, marked stale.
+    """
+    validators = None
+    if cache:
+        key = cache.key_for(city, lean)
+        if not force and (fresh := cache.fresh(key)):
+            return fresh
+        validators = cache.validators(key)
+
+    data = fetch_weather(city, cache, timeout=timeout, validators=validators, lean=lean)
+    if data.get("not_modified"):
+        unchanged = cache.touch(cache.key_for(city, lean)) if cache else None
+        if unchanged:
+            return unchanged
+        data = fetch_weather(city, cache, timeout=timeout, lean=lean)
+    if cache:
+        # Keyed after the fetch: auto-detect may only now know where we are
+        key = cache.key_for(city, lean)
+        if "error" not in data:
+            cache.put(key, data)
+        elif (hit := cache.lookup(key)):
+            data = mark_stale(*hit)
+    return data
+
+
+class FetchCoordinator:
+    """Single-flight, cancellable weather fetches shared by the whole UI."""
+
+    def __init__(self, cache: WeatherCache | None = None, demo_mode: str | None = None,
+                 workers: int = FETCH_WORKERS, timeout: float = FETCH_TIMEOUT,
+                 lean: bool = False):
+        self.cache     = cache
+        self.demo_mode = demo_mode
+        self.timeout   = timeout
+        self.lean      = lean
+
+        self._lock     = threading.Lock()
+        self._queue: queue.SimpleQueue[_Job] = queue.SimpleQueue()
+        self._jobs:    dict[str, _Job] = {}             # queued or in flight, by key
+        self._gen:     dict[str, int] = {}              # newest generation wanted, by key
+        self._results: dict[str, tuple[int, dict]] = {}  # published (gen, data), by key
+        self._workers  = workers
+        self._threads: list[threading.Thread] = []
+
+    # Requests
+    def request(self, city: str | None, force: bool = False) -> int:
+        """
+        Ask for fresh weather for `city`. Returns the request's generation; if
+        one is already queued or running for that location, that one is reused.
+        """
+        key = location_key(city)
+        with self._lock:
+            if self.demo_mode:
+                # Nothing to wait for: publish straight away so the first frame has it
+                gen                = self._gen.get(key, 0) + 1
+                self._gen[key]     = gen
+                self._results[key] = (gen, make_demo_data(self.demo_mode))
+                return gen
+            job = self._jobs.get(key)
+            if job:
+                job.force |= force     # only matters if it hasn't started yet
+                return job.gen
+            gen            = self._gen.get(key, 0) + 1
+            self._gen[key] = gen
+            job            = _Job(key, city, force, gen)
+            self._jobs[key] = job
+            self._ensure_workers()
+        self._queue.put(job)
+        return gen
+
+    def cancel(self, city: str | None):
+        """Drop whatever is queued or running for `city`; its result will be ignored."""
+        key = location_key(city)
+        with self._lock:
+            if self._jobs.pop(key, None):
+                self._gen[key] += 1
+
+    # Polling (render loop; lock-free)
+    def pending(self, city: str | None) -> bool:
+        return location_key(city) in self._jobs
+
+    def poll(self, city: str | None) -> tuple[int, dict] | None:
+        """The newest published (generation, data) for `city`, if any."""
+        key = location_key(city)
+        job = self._jobs.get(key)
+        if job and time.monotonic() - job.queued > self.timeout:
+            self._expire(job)
+        return self._results.get(key)
+
+    # Internals
+    def _expire(self, job: _Job):
+        """A request (queued or running) overran its timeout: publish an error and ignore its late result."""
+        with self._lock:
+            if self._jobs.get(job.key) is not job:
+                return
+            del self._jobs[job.key]
+            self._gen[job.key] += 1
+            data = self._fallback(job.city, f"timed out after {self.timeout:.0f}s")
+            self._results[job.key] = (self._gen[job.key], data)
+
+    def _fallback(self, city: str | None, message: str) -> dict:
+        hit = self.cache.lookup(self.cache.key_for(city, self.lean)) if self.cache else None
+        return mark_stale(*hit) if hit else {"error": message}
+
+    def _ensure_workers(self):
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(target=self._work, name="nimbus-fetch", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                if self._gen.get(job.key) != job.gen:
+                    continue               # cancelled or expired while queued
+
+            data = fetch_with_cache(job.city, self.cache, job.force, self.timeout, self.lean)
+
+            with self._lock:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+                if self._gen.get(job.key) == job.gen:
+                    self._results[job.key] = (job.gen, data)
+
+
+class RefreshSchedule:
+    """
+    When to refresh next, on the monotonic clock. After a good result the
+    wait is the interval plus random jitter; after a failure it's RETRY_BASE
+    doubled per consecutive failure (capped), also jittered. An interval of
+    0 or less disables automatic refreshes. `offset` delays only the first
+    automatic refresh, so schedules started together can be spread out; if a
+    fetch starts before that refresh (no cached data yet, or R), the offset
+    moves to the refresh after it.
+    """
+
+    def __init__(self, interval: float, age: float = 0.0, offset: float = 0.0):
+        self.interval = interval
+        self.failures = 0
+        self.next_due = float("inf")
+        self._offset  = offset
+        if interval > 0:
+            # First refresh when the data on screen reaches the interval
+            self._schedule(max(0.0, interval - age) + offset)
+
+    def set_interval(self, interval: float, offset: float = 0.0):
+        """Refresh every `interval` from the next result on (e.g. the daemon that did it went away)."""
+        self.interval = interval
+        self._offset  = offset
+
+    def _schedule(self, delay: float):
+        self.next_due = time.monotonic() + delay * (1 + random.uniform(0, REFRESH_JITTER))
+
+    def due(self) -> bool:
+        return time.monotonic() >= self.next_due
+
+    def started(self):
+        """A refresh is in flight; nothing is due until its result comes back."""
+        if self.due():
+            self._offset = 0.0     # the offset first refresh itself
+        self.next_due = float("inf")
+
+    def done(self, data: dict):
+        """Plan the next refresh from a result: back off while results are errors or stale fallbacks."""
+        if self.interval <= 0:
+            return
+        if "error" in data or data.get("stale"):
+            self.failures += 1
+            self._schedule(min(RETRY_MAX, RETRY_BASE * 2 ** (self.failures - 1)))
+        else:
+            self.failures = 0
+            self._schedule(self.interval + self._offset)
+            self._offset  = 0.0
@@ -0,0 +1,135 @@
+# Off-screen cell buffer that scenes draw into instead of the real screen.
+#
+# It exposes the small slice of the curses window API the renderers use
+# (getmaxyx / addstr / addch / erase / clear), so every draw_* function works
+# on it unchanged. flush() then sends only the cells that differ from the
+# previous frame, grouped into same-attribute runs.
+
+import curses
+
+# Unchanged cells shorter than this between two changed ones are re-sent
+# rather than splitting the run — one addstr is cheaper than two cursor moves.
+MERGE_GAP = 4
+
+
+class FrameBuffer:
+    """A grid of (char, attr) cells with diff-based flushing to a curses window."""
+
+    def __init__(self, h: int, w: int):
+        self.resize(h, w)
+
+    def resize(self, h: int, w: int):
+        """Reallocate for a new terminal size; the next flush repaints everything."""
+        self.h, self.w = h, w
+        self._blank_c  = [" "] * w
+        self._blank_a  = [0] * w
+        self.chars     = [self._blank_c[:] for _ in range(h)]
+        self.attrs     = [self._blank_a[:] for _ in range(h)]
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what the terminal shows so the next flush sends every cell."""
+        self._prev_c = None
+        self._prev_a = None
+
+    # curses window surface
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.h, self.w
+
+    def erase(self):
+        blank_c, blank_a = self._blank_c, self._blank_a
+        for row in self.chars:
+            row[:] = blank_c
+        for row in self.attrs:
+            row[:] = blank_a
+
+    def clear(self):
+        self.erase()
+        self.invalidate()
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0):
+        if not 0 <= y < self.h or x >= self.w:
+            return
+        if x < 0:
+            text, x = text[-x:], 0
+        text = text[:self.w - x]
+        n    = len(text)
+        self.chars[y][x:x + n] = text
+        self.attrs[y][x:x + n] = [attr] * n
+
+    def addch(self, y: int, x: int, ch, attr: int = 0):
+        if 0 <= y < self.h and 0 <= x < self.w:
+            self.chars[y][x] = chr(ch) if isinstance(ch, int) else ch
+            self.attrs[y][x] = attr
+
+    # Layer compositing
+    def blit(self, src: "FrameBuffer"):
+        """Copy a same-sized buffer (e.g. a cached static layer) over this one."""
+        for dst, row in zip(self.chars, src.chars):
+            dst[:] = row
+        for dst, row in zip(self.attrs, src.attrs):
+            dst[:] = row
+
+    def blit_at(self, src: "FrameBuffer", y: int, x: int):
+        """Copy a smaller buffer (e.g. a dashboard tile) into this one at (y, x), clipped."""
+        n = min(src.w, self.w - x)
+        if n <= 0 or x < 0:
+            return
+        for i in range(min(src.h, self.h - y)):
+            self.chars[y + i][x:x + n] = src.chars[i][:n]
+            self.attrs[y + i][x:x + n] = src.attrs[i][:n]
+
+    def draw_runs(self, runs: list[tuple[int, int, str, int]]):
+        """Paint pre-clipped (y, x, text, attr) runs, e.g. a layer overlay."""
+        chars, attrs = self.chars, self.attrs
+        for y, x, text, attr in runs:
+            n = len(text)
+            chars[y][x:x + n] = text
+            attrs[y][x:x + n] = [attr] * n
+
+    # Diffing
+    def diff(self) -> list[tuple[int, int, str, int]]:
+        """
+        Return (y, x, text, attr) runs covering every cell that changed since the
+        previous diff, and remember the current frame as the new baseline.
+        """
+        runs   = []
+        full   = self._prev_c is None
+        prev_c = self._prev_c or [None] * self.h
+        prev_a = self._prev_a or [None] * self.h
+        w      = self.w
+
+        for y, (chars, attrs) in enumerate(zip(self.chars, self.attrs)):
+            pc, pa = prev_c[y], prev_a[y]
+            if not full and chars == pc and attrs == pa:
+                continue
+
+            x = 0
+            while x < w:
+                if not full and chars[x] == pc[x] and attrs[x] == pa[x]:
+                    x += 1
+                    continue
+                start, attr, last = x, attrs[x], x
+                x += 1
+                while x < w and attrs[x] == attr and x - last <= MERGE_GAP:
+                    if full or chars[x] != pc[x] or attrs[x] != pa[x]:
+                        last = x
+                    x += 1
+                runs.append((y, start, "".join(chars[start:last + 1]), attr))
+                x = last + 1
+
+            prev_c[y] = chars[:]
+            prev_a[y] = attrs[:]
+
+        self._prev_c, self._prev_a = prev_c, prev_a
+        return runs
+
+    def flush(self, win) -> int:
+        """Write the changed runs to a curses window. Returns the number of addstr calls."""
+        runs = self.diff()
+        for y, x, text, attr in runs:
+            try:
+                win.addstr(y, x, text, attr)
+            except curses.error:
+                pass  # writing the bottom-right cell always raises
+        return len(runs)
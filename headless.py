@@ -0,0 +1,50 @@
+# Headless terminal.
+#
+# A stand-in for a curses window that needs no TTY: it keeps the screen
+# contents in a FrameBuffer and counts what would have been sent to the
+# terminal. Renderers and FrameBuffer.flush() work against it unchanged,
+# which is what the benchmarks (and one-shot rendering) build on.
+
+from framebuffer import FrameBuffer
+
+
+class HeadlessWindow(FrameBuffer):
+    """FrameBuffer with the rest of the curses window API as no-ops, plus output counters."""
+
+    def __init__(self, h: int, w: int):
+        super().__init__(h, w)
+        self.calls         = 0   # addstr/addch calls received
+        self.cells_written = 0   # characters those calls carried
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0):
+        self.calls         += 1
+        self.cells_written += len(text)
+        super().addstr(y, x, text, attr)
+
+    def addch(self, y: int, x: int, ch, attr: int = 0):
+        self.calls         += 1
+        self.cells_written += 1
+        super().addch(y, x, ch, attr)
+
+    def reset_counters(self):
+        self.calls         = 0
+        self.cells_written = 0
+
+    # Input and refresh: nothing to do without a terminal
+    def getch(self) -> int:
+        return -1
+
+    def timeout(self, _ms: int):
+        pass
+
+    def nodelay(self, _flag: bool):
+        pass
+
+    def keypad(self, _flag: bool):
+        pass
+
+    def refresh(self):
+        pass
+
+    def noutrefresh(self):
+        pass
@@ -0,0 +1,70 @@
+# Idle policy.
+#
+# An always-on pane nobody is looking at shouldn't animate at full rate.
+# After a while without input, or when the terminal reports that it lost
+# focus, the single-city view either drops to a low frame rate or freezes:
+# no simulation, no drawing, just a blocking getch() that wakes for a key,
+# for the next scheduled weather refresh, or now and then to pick up
+# results. Any key brings full rate back on the spot.
+
+from __future__ import annotations
+import curses
+import math
+import time
+
+from keys import read_key, KEY_FOCUS_OUT
+
+# Default seconds without input before going idle
+DEFAULT_IDLE_AFTER = 300.0
+
+# While frozen: longest single sleep (so daemon pushes and stale-age text
+# still get picked up), and how often to look while a fetch is in flight
+IDLE_WAKE    = 30.0
+PENDING_POLL = 0.5
+
+
+class IdlePolicy:
+    """
+    Whether the pane is idle and what that means. `after` is the input
+    timeout in seconds (0 = only focus loss counts); `fps` the frame rate
+    while idle (0 = freeze).
+    """
+
+    def __init__(self, after: float = DEFAULT_IDLE_AFTER, fps: int = 0):
+        self.after       = after
+        self.fps         = fps
+        self.focused     = True
+        self._last_input = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        if not self.focused:
+            return True
+        return self.after > 0 and time.monotonic() - self._last_input >= self.after
+
+    @property
+    def frozen(self) -> bool:
+        return self.fps <= 0 and self.idle
+
+    def key(self, key: int):
+        """Note a key from the terminal. Focus-out makes us idle; a real key (or focus-in) is someone there."""
+        if key in (-1, curses.KEY_RESIZE):
+            return
+        if key == KEY_FOCUS_OUT:
+            self.focused = False
+            return
+        self.focused     = True
+        self._last_input = time.monotonic()
+
+    def block(self, win, next_due: float, pending: bool) -> int:
+        """
+        Frozen wait: block in getch() until a key, the next refresh
+        (`next_due` on the monotonic clock) or the next periodic wake.
+        Returns the key, or -1 when it's time to look at the world again.
+        """
+        wake = PENDING_POLL if pending else IDLE_WAKE
+        left = min(wake, next_due - time.monotonic())
+        if left <= 0:
+            return -1
+        win.timeout(max(1, math.ceil(left * 1000)))
+        return read_key(win)
@@ -0,0 +1,63 @@
+# Keyboard input.
+#
+# curses only turns escape sequences it finds in terminfo into KEY_* codes;
+# anything else (CSI arrows from a terminal in normal cursor mode, focus
+# reports) arrives as ESC followed by the rest of the sequence, and a bare
+# ESC means quit. read_key() reassembles those sequences so they are never
+# mistaken for an Esc press. The ANSI backend parses with the same table.
+
+from __future__ import annotations
+import curses
+import os
+import sys
+
+# Terminal focus reports (enabled with focus_reporting()), as key codes past curses' own
+KEY_FOCUS_IN  = curses.KEY_MAX + 1
+KEY_FOCUS_OUT = curses.KEY_MAX + 2
+
+ESCAPE_KEYS = {
+    b"\x1b[A": curses.KEY_UP,    b"\x1bOA": curses.KEY_UP,
+    b"\x1b[B": curses.KEY_DOWN,  b"\x1bOB": curses.KEY_DOWN,
+    b"\x1b[C": curses.KEY_RIGHT, b"\x1bOC": curses.KEY_RIGHT,
+    b"\x1b[D": curses.KEY_LEFT,  b"\x1bOD": curses.KEY_LEFT,
+    b"\x1b[H": curses.KEY_HOME,  b"\x1bOH": curses.KEY_HOME,
+    b"\x1b[F": curses.KEY_END,   b"\x1bOF": curses.KEY_END,
+    b"\x1b[I": KEY_FOCUS_IN,
+    b"\x1b[O": KEY_FOCUS_OUT,
+}
+
+# Longest escape sequence we bother collecting
+MAX_SEQUENCE = 16
+
+
+def read_key(win) -> int:
+    """
+    win.getch(), except that an escape sequence comes back as one key:
+    its KEY_* code, or -1 if it isn't one we know. A lone ESC is 27.
+    """
+    key = win.getch()
+    if key != 27:
+        return key
+    seq = bytearray(b"\x1b")
+    win.nodelay(True)
+    try:
+        while len(seq) < MAX_SEQUENCE:
+            ch = win.getch()
+            if not 0 <= ch < 256:
+                break
+            seq.append(ch)
+            if len(seq) >= 3 and 0x40 <= ch <= 0x7E:
+                break                  # final byte of CSI / SS3
+    finally:
+        win.nodelay(False)
+    if len(seq) == 1:
+        return 27
+    return ESCAPE_KEYS.get(bytes(seq), -1)
+
+
+def focus_reporting(enable: bool):
+    """Ask the terminal to send (or stop sending) focus in/out reports."""
+    try:
+        os.write(sys.stdout.fileno(), b"\x1b[?1004h" if enable else b"\x1b[?1004l")
+    except OSError:
+        pass
@@ -0,0 +1,73 @@
+# Cached static layers.
+#
+# Everything in the scene region that depends only on (weather type, terminal
+# size) — sky fill, ground strip, house — is rendered once into a StaticLayer
+# and kept in a small LRU cache. Each frame blits the base layer, draws the
+# moving things, then paints the overlay. The info panel lives in its own
+# window (see regions.py) and is not part of the layer.
+
+from __future__ import annotations
+from collections import OrderedDict
+
+from assets import HOUSE
+from framebuffer import FrameBuffer
+from scenes import draw_static_scene
+from sprites import house_sprite
+from ui import PANEL_ROWS, STATUS_ROWS
+
+# Distinct sizes × weather types we keep around (resizing back and forth is common)
+LAYER_CACHE_SIZE = 8
+
+
+class StaticLayer:
+    """
+    Pre-rendered static content for one scene at one size.
+      base    — scene-region buffer blitted under the particles
+      overlay — (y, x, text, attr) runs painted over the particles (the house)
+    """
+
+    def __init__(self, base: FrameBuffer, overlay: list[tuple[int, int, str, int]]):
+        self.base    = base
+        self.overlay = overlay
+
+
+class LayerCache:
+    """Tiny LRU of StaticLayers keyed by (weather type, h, w)."""
+
+    def __init__(self, maxsize: int = LAYER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._layers: OrderedDict[tuple, StaticLayer] = OrderedDict()
+
+    def get(self, weather_type: str, h: int, w: int) -> StaticLayer:
+        key   = (weather_type, h, w)
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            return layer
+
+        layer = build_static_layer(weather_type, h, w)
+        self._layers[key] = layer
+        if len(self._layers) > self.maxsize:
+            self._layers.popitem(last=False)
+        return layer
+
+    def clear(self):
+        self._layers.clear()
+
+
+def house_origin(h: int, w: int) -> tuple[int, int]:
+    """Top-left (y, x) of the house for a screen of the given size."""
+    return max(1, h - 14 - len(HOUSE) + 2), max(0, (w - 22) // 2)
+
+
+def build_static_layer(weather_type: str, h: int, w: int) -> StaticLayer:
+    """The scene region's layer for an h × w terminal (the region is shorter than h)."""
+    scene_h = h - PANEL_ROWS - STATUS_ROWS
+    base    = FrameBuffer(scene_h, w)
+    draw_static_scene(base, weather_type, sky_height=scene_h - 1)
+
+    # The house is clipped to the scene region
+    house_y, house_x = house_origin(h, w)
+    overlay = house_sprite(weather_type == "sun").place(house_y, house_x, scene_h, w - 1)
+
+    return StaticLayer(base, overlay)
@@ -11,16 +11,29 @@ Usage:
     python -m nimbus "New York"
     python -m nimbus --demo rain          # offline demo
     python -m nimbus --demo snow/sun/cloud/thunder/fog
+    python -m nimbus --fps 30 --adaptive  # pace rendering to the terminal
+    python -m nimbus --bench              # headless render benchmark (JSON)
+    python -m nimbus --refresh 300        # auto-refresh about every 5 minutes
+    python -m nimbus London Tokyo Lagos   # dashboard, one tile per city
+    python -m nimbus --serve              # shared fetch daemon for this host
+    python -m nimbus London --once        # print one frame and exit (no TTY needed)
 """
 
+import startup  # first, so the startup trace clock covers every other import
+
 import curses
+import json
 import sys
-import time
 import argparse
 
-from app import run
+from app import run, FPS
+from cache import DEFAULT_TTL
+from fetcher import DEFAULT_REFRESH
+from idle import DEFAULT_IDLE_AFTER
 from weather import REQUESTS_OK
 
+startup.mark("imports")
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -28,8 +41,9 @@ def parse_args() -> argparse.Namespace:
         description="Nimbus — Animated ASCII weather in your terminal",
     )
     parser.add_argument(
-        "city", nargs="?", default=None,
-        help="City name (e.g. 'London', 'Bengaluru'). Omit to auto-detect.",
+        "city", nargs="*", default=[],
+        help="City name (e.g. 'London', 'Bengaluru'). Omit to auto-detect; "
+             "give several for a dashboard of tiles.",
     )
     parser.add_argument(
         "--demo",
@@ -37,12 +51,125 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Run in demo mode (no internet needed)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--fps", type=int, default=FPS,
+        help=f"Target frames per second (default: {FPS})",
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help="Draw less often when the terminal can't keep up with --fps",
+    )
+    parser.add_argument(
+        "--idle-after", type=float, default=DEFAULT_IDLE_AFTER, metavar="SECONDS",
+        help=f"Go idle after this long without a keypress (or when the terminal loses focus); "
+             f"0 = only on focus loss (default: {DEFAULT_IDLE_AFTER:.0f})",
+    )
+    parser.add_argument(
+        "--idle-fps", type=int, default=0, metavar="FPS",
+        help="Frame rate while idle; 0 freezes the picture until a key or the next refresh (default: 0)",
+    )
+    parser.add_argument(
+        "--quality", choices=["auto", "high", "medium", "low", "minimal"], default="auto",
+        help="Level of detail: fixed, or auto to drop particles and effects when "
+             "frames run over budget and bring them back when there's room (default: auto)",
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=None, metavar="SECONDS",
+        help=f"How long cached weather counts as fresh (default: {DEFAULT_TTL}, "
+             f"or the --refresh interval if that's shorter)",
+    )
+    parser.add_argument(
+        "--refresh", type=float, default=DEFAULT_REFRESH, metavar="SECONDS",
+        help=f"Refresh the weather automatically about this often; 0 = only on R (default: {DEFAULT_REFRESH:.0f})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Don't read or write the on-disk weather cache",
+    )
+    parser.add_argument(
+        "--lean", action="store_true",
+        help="Ask wttr.in for just the current conditions (tiny response; no visibility or "
+             "forecast). The dashboard always does",
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Run the shared weather daemon: fetch once per city for every Nimbus on this host",
+    )
+    parser.add_argument(
+        "--socket", metavar="PATH", default=None,
+        help="Unix socket of the weather daemon (default: $XDG_RUNTIME_DIR/nimbus.sock)",
+    )
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="Fetch directly even if a weather daemon is running",
+    )
+    parser.add_argument(
+        "--backend", choices=["curses", "ansi"], default="curses",
+        help="Draw through curses, or write ANSI escape codes directly: "
+             "one write per frame, 24-bit color on truecolor terminals (default: curses)",
+    )
+    parser.add_argument(
+        "--profile", metavar="PATH", default=None,
+        help="Time every phase of the main loop and write a JSON summary to PATH on exit",
+    )
+    parser.add_argument(
+        "--trace", metavar="PATH", default=None,
+        help="Write a Chrome trace (chrome://tracing, Perfetto) of every frame's phases to PATH",
+    )
+    parser.add_argument(
+        "--startup-trace", action="store_true",
+        help="On exit, print how long imports, curses setup and the first frame took",
+    )
+    parser.add_argument(
+        "--once", nargs="?", const="auto", default=None, choices=["auto", "text", "ansi"],
+        help="Print a single frame to stdout and exit — plain text, ANSI colors, "
+             "or ANSI only when stdout is a terminal (default: auto)",
+    )
+    parser.add_argument(
+        "--bench", nargs="?", type=int, const=200, default=None, metavar="FRAMES",
+        help="Benchmark every scene headlessly at several sizes and print JSON (default: 200 frames)",
+    )
+    args = parser.parse_args()
+    if args.fps < 1:
+        parser.error("--fps must be at least 1")
+    if args.idle_fps < 0:
+        parser.error("--idle-fps can't be negative")
+    return args
 
 
 def main():
     args = parse_args()
 
+    if args.bench is not None:
+        from bench import run_bench
+        print(json.dumps(run_bench(frames=max(1, args.bench)), indent=2))
+        return
+
+    if args.serve:
+        from daemon import serve, default_socket_path
+        print(f"Nimbus weather daemon listening on {args.socket or default_socket_path()}")
+        try:
+            serve(args.socket, cache_ttl=args.cache_ttl, use_cache=not args.no_cache,
+                  refresh=args.refresh, lean=args.lean)
+        except RuntimeError as exc:
+            sys.exit(str(exc))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.once:
+        from snapshot import snapshot
+        style = args.once
+        if style == "auto":
+            style = "ansi" if sys.stdout.isatty() else "text"
+        print(snapshot(args.city[0] if args.city else None, args.demo, style,
+                       cache_ttl=DEFAULT_TTL if args.cache_ttl is None else args.cache_ttl,
+                       use_cache=not args.no_cache, lean=args.lean))
+        if args.startup_trace:
+            startup.mark("snapshot printed")
+            print(startup.report(), file=sys.stderr)
+        return
+
     # Prompt the user if requests isn't installed and no demo mode was chosen
     if not REQUESTS_OK and not args.demo:
         print("Note: the 'requests' library is not installed.")
@@ -56,15 +183,37 @@ def main():
             sys.exit(1)
 
     print("Starting Nimbus…")
-    print("Controls:  R = refresh weather   Q = quit")
+    print("Controls:  R = refresh weather   ←/→ = forecast   P = profiler   Q = quit")
     print()
-    time.sleep(0.4)
 
+    # Several cities get the tiled dashboard, one (or none) the full-screen scene
+    if len(args.city) > 1:
+        from dashboard import run_dashboard
+        target, where, extra = run_dashboard, args.city, {"lean": True}
+    else:
+        target, where = run, (args.city[0] if args.city else None)
+        extra = {"idle_after": args.idle_after, "idle_fps": args.idle_fps, "lean": args.lean}
+
+    if args.backend == "ansi":
+        from ansi import wrapper
+    else:
+        wrapper = curses.wrapper
+
+    startup.mark("arguments parsed")
     try:
-        curses.wrapper(run, args.city, args.demo)
+        wrapper(target, where, args.demo, fps=args.fps, adaptive=args.adaptive,
+                profile_out=args.profile, trace_out=args.trace,
+                cache_ttl=args.cache_ttl, use_cache=not args.no_cache,
+                refresh=args.refresh, socket_path=args.socket,
+                use_daemon=not args.no_daemon, quality=args.quality, **extra)
     except KeyboardInterrupt:
         pass
 
+    for path in (args.profile, args.trace):
+        if path:
+            print(f"Profile written to {path}")
+    if args.startup_trace:
+        print(startup.report())
     print("\nThanks for using Nimbus! 🌤")
 
 
@@ -1,52 +1,231 @@
+import array
 import random
 import math
 
+from assets import CLOUD_SHAPES, CLOUD_SHAPES_2
 
-class RainDrop:
-    """A single falling raindrop. Speed and wind can be tuned per weather type."""
+# NumPy is optional — without it the pools fall back to flat `array` buffers
+try:
+    import numpy as np
+    NUMPY_OK = True
+except ImportError:
+    NUMPY_OK = False
 
-    def __init__(self, max_x: int, max_y: int):
-        self.max_x = max_x
-        self.max_y = max_y
-        self._randomize(initial=True)
+_rng = np.random.default_rng() if NUMPY_OK else None
+
+# Particles per screen cell; the array-backed pools make large counts cheap
+DROP_DENSITY  = 0.02
+FLAKE_DENSITY = 0.02
+
+# Hard ceilings so giant wall displays stay within the frame budget
+MAX_DROPS  = 4000
+MAX_FLAKES = 2500
+
+
+def seed(value: int):
+    """Seed every random source the particles draw from (reproducible benchmarks)."""
+    global _rng
+    random.seed(value)
+    if NUMPY_OK:
+        _rng = np.random.default_rng(value)
+
+
+def _uniform(n: int, lo: float, hi: float):
+    """A buffer of `n` uniform floats in [lo, hi)."""
+    if NUMPY_OK:
+        return _rng.uniform(lo, hi, n)
+    return array.array("d", (random.uniform(lo, hi) for _ in range(n)))
+
+
+def _choice_idx(n: int, k: int):
+    """A buffer of `n` random indices into a table of length `k`."""
+    if NUMPY_OK:
+        return _rng.integers(0, k, n)
+    return array.array("l", (random.randrange(k) for _ in range(n)))
+
+
+def _scale(buf, factor: float):
+    """Multiply a buffer by `factor` in place."""
+    if factor == 1:
+        return
+    if NUMPY_OK:
+        buf *= factor
+        return
+    for i in range(len(buf)):
+        buf[i] *= factor
+
+
+def _fit(buf, n: int, fresh):
+    """`buf` cut down to `n` entries, or extended with `fresh(extra)` new ones."""
+    extra = n - len(buf)
+    if extra <= 0:
+        if NUMPY_OK:
+            return buf[:n]
+        del buf[n:]
+        return buf
+    if NUMPY_OK:
+        return np.concatenate((buf, fresh(extra)))
+    buf.extend(fresh(extra))
+    return buf
+
+
+class DropPool:
+    """
+    Struct-of-arrays pool of falling raindrops.
+    Positions and speeds live in flat buffers so a whole frame of rain is one
+    vectorized step (NumPy) or one tight loop (array fallback).
+    """
+
+    def __init__(self, max_x: int, max_y: int, count: int):
+        self.max_x       = max_x
+        self.max_y       = max_y
+        self.count       = count
+        self.speed_range = (1.2, 2.0)
+        self.x           = _uniform(count, 0, max_x)
+        self.y           = _uniform(count, -max_y * 0.5, 0)
+        self.speed       = _uniform(count, *self.speed_range)
 
-    def _randomize(self, initial=False):
-        self.x     = random.uniform(0, self.max_x)
-        self.y     = random.uniform(-self.max_y * 0.5, 0) if initial else 0
-        self.speed = random.uniform(1.2, 2.0)
-        self.char  = random.choice(["|", "|", "╎"])
+    def retune(self, lo: float, hi: float):
+        """Re-roll any drop whose speed falls outside [lo, hi] (rain <-> thunder)."""
+        self.speed_range = (lo, hi)
+        if NUMPY_OK:
+            bad = (self.speed < lo) | (self.speed > hi)
+            n   = int(bad.sum())
+            if n:
+                self.speed[bad] = _rng.uniform(lo, hi, n)
+            return
+        speed = self.speed
+        for i in range(self.count):
+            if not lo <= speed[i] <= hi:
+                speed[i] = random.uniform(lo, hi)
+
+    def resize(self, max_x: int, max_y: int, count: int):
+        """
+        Fit the pool to a new screen in place: drops keep their relative
+        positions, and the pool is trimmed or topped up (across the whole
+        sky, not just above it) to `count`.
+        """
+        _scale(self.x, max_x / self.max_x)
+        _scale(self.y, max_y / self.max_y)
+        self.max_x, self.max_y = max_x, max_y
+        self.x     = _fit(self.x,     count, lambda n: _uniform(n, 0, max_x))
+        self.y     = _fit(self.y,     count, lambda n: _uniform(n, -max_y * 0.5, max_y))
+        self.speed = _fit(self.speed, count, lambda n: _uniform(n, *self.speed_range))
+        self.count = count
 
     def update(self, wind: float = 0.15):
-        self.y += self.speed
-        self.x += wind
-        if self.y > self.max_y or self.x > self.max_x:
-            self._randomize()
+        """Advance every drop one step, respawning those that left the screen."""
+        max_x, max_y = self.max_x, self.max_y
+        lo, hi       = self.speed_range
+        if NUMPY_OK:
+            self.y += self.speed
+            self.x += wind
+            dead = (self.y > max_y) | (self.x > max_x)
+            n    = int(dead.sum())
+            if n:
+                self.x[dead]     = _rng.uniform(0, max_x, n)
+                self.y[dead]     = 0.0
+                self.speed[dead] = _rng.uniform(lo, hi, n)
+            return
+        x, y, speed = self.x, self.y, self.speed
+        for i in range(self.count):
+            y[i] += speed[i]
+            x[i] += wind
+            if y[i] > max_y or x[i] > max_x:
+                x[i]     = random.uniform(0, max_x)
+                y[i]     = 0.0
+                speed[i] = random.uniform(lo, hi)
+
+    def visible(self, rows: int, cols: int) -> list[tuple]:
+        """(iy, ix, x) for every drop inside a rows × cols region; x is the raw float column."""
+        if NUMPY_OK:
+            iy   = self.y.astype(np.int64)
+            ix   = self.x.astype(np.int64)
+            mask = (iy >= 0) & (iy < rows) & (ix >= 0) & (ix < cols)
+            return list(zip(iy[mask].tolist(), ix[mask].tolist(), self.x[mask].tolist()))
+        out = []
+        for fx, fy in zip(self.x, self.y):
+            iy, ix = int(fy), int(fx)
+            if 0 <= iy < rows and 0 <= ix < cols:
+                out.append((iy, ix, fx))
+        return out
 
 
-class Snowflake:
-    """A drifting snowflake that sways side-to-side via a sine wave."""
+class FlakePool:
+    """Struct-of-arrays pool of snowflakes swaying side-to-side via a sine wave."""
 
     CHARS = ["*", "*", "·", "•", "+", "·"]
 
-    def __init__(self, max_x: int, max_y: int):
-        self.max_x = max_x
-        self.max_y = max_y
-        self._randomize(initial=True)
+    def __init__(self, max_x: int, max_y: int, count: int):
+        self.max_x      = max_x
+        self.max_y      = max_y
+        self.count      = count
+        self.x          = _uniform(count, 0, max_x)
+        self.y          = _uniform(count, -max_y * 0.3, 0)
+        self.speed      = _uniform(count, 0.3, 0.9)
+        self.drift_freq = _uniform(count, 0.05, 0.15)
+        self.t          = _uniform(count, 0, math.pi * 2)
+        self.char       = _choice_idx(count, len(self.CHARS))
 
-    def _randomize(self, initial=False):
-        self.x          = random.uniform(0, self.max_x)
-        self.y          = random.uniform(-self.max_y * 0.3, 0) if initial else -2
-        self.speed      = random.uniform(0.3, 0.9)
-        self.drift_freq = random.uniform(0.05, 0.15)
-        self.t          = random.uniform(0, math.pi * 2)
-        self.char       = random.choice(self.CHARS)
+    def resize(self, max_x: int, max_y: int, count: int):
+        """Fit the pool to a new screen in place, like DropPool.resize()."""
+        _scale(self.x, max_x / self.max_x)
+        _scale(self.y, max_y / self.max_y)
+        self.max_x, self.max_y = max_x, max_y
+        self.x          = _fit(self.x,          count, lambda n: _uniform(n, 0, max_x))
+        self.y          = _fit(self.y,          count, lambda n: _uniform(n, -max_y * 0.3, max_y))
+        self.speed      = _fit(self.speed,      count, lambda n: _uniform(n, 0.3, 0.9))
+        self.drift_freq = _fit(self.drift_freq, count, lambda n: _uniform(n, 0.05, 0.15))
+        self.t          = _fit(self.t,          count, lambda n: _uniform(n, 0, math.pi * 2))
+        self.char       = _fit(self.char,       count, lambda n: _choice_idx(n, len(self.CHARS)))
+        self.count      = count
 
     def update(self):
-        self.y  += self.speed
-        self.t  += self.drift_freq
-        self.x  += math.sin(self.t) * 0.4
-        if self.y > self.max_y:
-            self._randomize()
+        """Advance every flake one step, respawning those that fell off the bottom."""
+        max_x, max_y = self.max_x, self.max_y
+        if NUMPY_OK:
+            self.y += self.speed
+            self.t += self.drift_freq
+            self.x += np.sin(self.t) * 0.4
+            dead = self.y > max_y
+            n    = int(dead.sum())
+            if n:
+                self.x[dead]          = _rng.uniform(0, max_x, n)
+                self.y[dead]          = -2.0
+                self.speed[dead]      = _rng.uniform(0.3, 0.9, n)
+                self.drift_freq[dead] = _rng.uniform(0.05, 0.15, n)
+                self.t[dead]          = _rng.uniform(0, math.pi * 2, n)
+                self.char[dead]       = _rng.integers(0, len(self.CHARS), n)
+            return
+        x, y, speed, freq, t, char = self.x, self.y, self.speed, self.drift_freq, self.t, self.char
+        sin, n_chars = math.sin, len(self.CHARS)
+        for i in range(self.count):
+            y[i] += speed[i]
+            t[i] += freq[i]
+            x[i] += sin(t[i]) * 0.4
+            if y[i] > max_y:
+                x[i]     = random.uniform(0, max_x)
+                y[i]     = -2.0
+                speed[i] = random.uniform(0.3, 0.9)
+                freq[i]  = random.uniform(0.05, 0.15)
+                t[i]     = random.uniform(0, math.pi * 2)
+                char[i]  = random.randrange(n_chars)
+
+    def visible(self, rows: int, cols: int) -> list[tuple]:
+        """(iy, ix, ch) for every flake inside a rows × cols region."""
+        chars = self.CHARS
+        if NUMPY_OK:
+            iy   = self.y.astype(np.int64)
+            ix   = self.x.astype(np.int64)
+            mask = (iy >= 0) & (iy < rows) & (ix >= 0) & (ix < cols)
+            return [(y, x, chars[c]) for y, x, c in
+                    zip(iy[mask].tolist(), ix[mask].tolist(), self.char[mask].tolist())]
+        out = []
+        for fx, fy, c in zip(self.x, self.y, self.char):
+            iy, ix = int(fy), int(fx)
+            if 0 <= iy < rows and 0 <= ix < cols:
+                out.append((iy, ix, chars[c]))
+        return out
 
 
 class Cloud:
@@ -60,7 +239,63 @@ class Cloud:
         self.x     = float(random.randint(-5, max_x))
         self.speed = random.uniform(0.05, 0.15)
 
+    def resize(self, max_x: int):
+        """Keep the cloud at the same relative position on a wider or narrower screen."""
+        self.x    *= max_x / self.max_x
+        self.max_x = max_x
+
     def update(self):
         self.x += self.speed
         if self.x > self.max_x + self.width:
-            self.x = float(-self.width - 5)
\ No newline at end of file
+            self.x = float(-self.width - 5)
+
+
+# Particle sets (one dict of pools and clouds per scene)
+def _particle_counts(w: int, h: int, scale: float = 1.0) -> tuple[int, int]:
+    """(drops, flakes) for a w × h screen, times `scale` (the quality level's share)."""
+    return (int(min(MAX_DROPS,  w * h * DROP_DENSITY)  * scale),
+            int(min(MAX_FLAKES, w * h * FLAKE_DENSITY) * scale))
+
+
+def spawn_particles(w: int, h: int, scale: float = 1.0) -> dict:
+    """Create the initial particle pools and cloud fleet."""
+    num_drops, num_flakes = _particle_counts(w, h, scale)
+    return {
+        "drops":  DropPool(w, h, num_drops),
+        "flakes": FlakePool(w, h, num_flakes),
+        "clouds": [
+            Cloud(w, random.randint(1, 6), CLOUD_SHAPES),
+            Cloud(w, random.randint(2, 5), CLOUD_SHAPES_2),
+            Cloud(w, random.randint(1, 4), CLOUD_SHAPES),
+            Cloud(w, random.randint(3, 7), CLOUD_SHAPES_2),
+            Cloud(w, random.randint(1, 5), CLOUD_SHAPES),
+        ],
+    }
+
+
+def resize_particles(particles: dict, w: int, h: int, scale: float = 1.0):
+    """
+    Fit existing particles to a new screen size (or quality level) in place
+    instead of respawning them.
+    """
+    num_drops, num_flakes = _particle_counts(w, h, scale)
+    particles["drops"].resize(w, h, num_drops)
+    particles["flakes"].resize(w, h, num_flakes)
+    for cloud in particles["clouds"]:
+        cloud.resize(w)
+
+
+def update_particles(particles: dict, wtype: str):
+    """Advance all particles one simulation step. Thunder drops are faster and more diagonal."""
+    drops = particles["drops"]
+    if wtype == "thunder":
+        drops.retune(2.5, 4.0)
+        drops.update(wind=0.9)
+    else:
+        drops.retune(1.2, 2.0)
+        drops.update(wind=0.15)
+
+    particles["flakes"].update()
+
+    for cloud in particles["clouds"]:
+        cloud.update()
@@ -0,0 +1,158 @@
+# Frame profiler.
+#
+# Splits each pass of the main loop into named phases with cheap lap timing,
+# keeps rolling windows for live percentiles (the on-screen HUD), cumulative
+# histograms for the exit summary, and optionally a Chrome trace
+# (chrome://tracing / Perfetto) of every phase of every frame.
+
+from __future__ import annotations
+import json
+import time
+from collections import deque
+
+PHASES = ("sleep", "input", "fetch", "update", "scene", "house", "info", "refresh")
+
+# Frames kept for the live percentiles and FPS readout
+WINDOW = 240
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+# Stop recording trace events past this many (about 15 minutes at 20 FPS)
+MAX_TRACE_EVENTS = 150_000
+
+
+def _percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def _bucket(ms: float) -> int:
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+class FrameProfiler:
+    """
+    Lap-based phase timer. Call lap(phase) after each phase of the loop and
+    end_frame() once per frame; everything in between is attributed to the
+    named phase. While disabled every call returns immediately.
+    """
+
+    def __init__(self, enabled: bool = False, trace: bool = False):
+        self.enabled   = enabled or trace
+        self.trace     = trace
+        self.hud       = False
+
+        self.frames    = 0
+        self._origin   = time.perf_counter()
+        self._last     = self._origin
+        self._current  = dict.fromkeys(PHASES, 0.0)
+        self._calls    = 0
+
+        self._recent   = {p: deque(maxlen=WINDOW) for p in PHASES + ("frame",)}
+        self._ends     = deque(maxlen=WINDOW)
+        self._calls_w  = deque(maxlen=WINDOW)
+        self._hist     = {p: [0] * (len(BUCKETS_MS) + 1) for p in PHASES + ("frame",)}
+        self._totals   = dict.fromkeys(PHASES + ("frame",), 0.0)
+        self._events: list[dict] = []
+
+    def toggle_hud(self):
+        """Show/hide the overlay; showing it switches instrumentation on."""
+        self.hud = not self.hud
+        if self.hud and not self.enabled:
+            self.enabled = True
+            self._last   = time.perf_counter()
+
+    def lap(self, phase: str):
+        if not self.enabled:
+            return
+        now  = time.perf_counter()
+        span = now - self._last
+        self._current[phase] += span
+        if self.trace and len(self._events) < MAX_TRACE_EVENTS:
+            self._events.append({
+                "name": phase, "ph": "X", "pid": 1, "tid": 1,
+                "ts":   round((self._last - self._origin) * 1e6, 1),
+                "dur":  round(span * 1e6, 1),
+            })
+        self._last = now
+
+    def count_calls(self, n: int):
+        """Terminal write calls made this frame (FrameBuffer.flush's return value)."""
+        self._calls += n
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        total = 0.0   # frame time = work only; sleeping until the deadline isn't cost
+        for phase, secs in self._current.items():
+            ms     = secs * 1000
+            if phase != "sleep":
+                total += ms
+            self._recent[phase].append(ms)
+            self._hist[phase][_bucket(ms)] += 1
+            self._totals[phase] += ms
+            self._current[phase] = 0.0
+        self._recent["frame"].append(total)
+        self._hist["frame"][_bucket(total)] += 1
+        self._totals["frame"] += total
+        self._calls_w.append(self._calls)
+        self._calls = 0
+        self._ends.append(self._last)
+        self.frames += 1
+
+    # Reporting
+    def fps(self) -> float:
+        if len(self._ends) < 2:
+            return 0.0
+        return (len(self._ends) - 1) / (self._ends[-1] - self._ends[0])
+
+    def hud_lines(self) -> list[str]:
+        """Short lines for the on-screen overlay."""
+        frame = self._recent["frame"]
+        calls = self._calls_w
+        lines = [
+            f"FPS {self.fps():5.1f}   frames {self.frames}",
+            f"frame p50 {_percentile(frame, 50):6.2f} ms",
+            f"frame p99 {_percentile(frame, 99):6.2f} ms",
+            f"calls/frame {sum(calls) / len(calls) if calls else 0:6.1f}",
+        ]
+        for phase in PHASES:
+            recent = self._recent[phase]
+            avg    = sum(recent) / len(recent) if recent else 0.0
+            lines.append(f"{phase:<8} {avg:6.2f} ms")
+        return lines
+
+    def summary(self) -> dict:
+        """JSON-ready summary of the whole run."""
+        n = max(1, self.frames)
+        return {
+            "frames":       self.frames,
+            "fps":          round(self.fps(), 2),
+            "buckets_ms":   list(BUCKETS_MS) + ["inf"],
+            "phases": {
+                phase: {
+                    "mean_ms":   round(self._totals[phase] / n, 4),
+                    # percentiles cover the last WINDOW frames, the histogram all of them
+                    "recent_p50_ms": round(_percentile(self._recent[phase], 50), 4),
+                    "recent_p99_ms": round(_percentile(self._recent[phase], 99), 4),
+                    "histogram": self._hist[phase],
+                }
+                for phase in PHASES + ("frame",)
+            },
+            "calls_per_frame": round(sum(self._calls_w) / len(self._calls_w), 2) if self._calls_w else 0,
+        }
+
+    def dump(self, summary_path: str | None = None, trace_path: str | None = None):
+        """Write the JSON summary and/or the Chrome trace."""
+        if summary_path:
+            with open(summary_path, "w") as fh:
+                json.dump(self.summary(), fh, indent=2)
+        if trace_path:
+            with open(trace_path, "w") as fh:
+                json.dump({"traceEvents": self._events, "displayTimeUnit": "ms"}, fh)
@@ -0,0 +1,82 @@
+# Level of detail.
+#
+# QualityGovernor watches what fraction of each frame's budget the drawn
+# frames actually use, smoothed, and trades detail for time when the host or
+# the terminal can't keep up: fewer active particles first, then no thunder
+# streaks, coarser fog and no full-sky lightning flash. When there is room
+# again it steps back up. Each change is held for a while so the level
+# doesn't flap between two neighbours.
+
+from __future__ import annotations
+import time
+
+from scheduler import EMA_WEIGHT
+
+# Smoothed busy fraction of the frame budget above which detail is dropped,
+# and below which it is restored
+DEGRADE_LOAD = 0.75
+RESTORE_LOAD = 0.30
+
+# Seconds to wait after a change before the next one
+HOLD = 2.0
+
+
+class Quality:
+    """
+    One level of detail.
+      particles  — fraction of the density target kept active
+      streaks    — thunder rain draws its second, dim streak row
+      fog_stride — fog is drawn on every n-th sky row
+      flash      — lightning fills the whole sky
+    """
+
+    __slots__ = ("name", "particles", "streaks", "fog_stride", "flash")
+
+    def __init__(self, name: str, particles: float, streaks: bool, fog_stride: int, flash: bool):
+        self.name       = name
+        self.particles  = particles
+        self.streaks    = streaks
+        self.fog_stride = fog_stride
+        self.flash      = flash
+
+
+LEVELS = (
+    Quality("high",    1.0,  True,  1, True),
+    Quality("medium",  0.6,  True,  1, True),
+    Quality("low",     0.35, False, 2, False),
+    Quality("minimal", 0.15, False, 3, False),
+)
+HIGH = LEVELS[0]
+
+
+class QualityGovernor:
+    """Picks the level of detail from measured frame cost, or holds a fixed one."""
+
+    def __init__(self, fixed: str | None = None):
+        names       = [level.name for level in LEVELS]
+        self.auto   = fixed in (None, "auto")
+        self.index  = 0 if self.auto else names.index(fixed)
+        self.load   = 0.0
+        self._until = time.perf_counter() + HOLD    # let startup settle first
+
+    @property
+    def level(self) -> Quality:
+        return LEVELS[self.index]
+
+    def observe(self, busy: float) -> bool:
+        """Feed in a drawn frame's busy fraction of its budget; True if the level changed."""
+        if not self.auto:
+            return False
+        self.load += EMA_WEIGHT * (busy - self.load)
+        now = time.perf_counter()
+        if now < self._until:
+            return False
+
+        if self.load > DEGRADE_LOAD and self.index < len(LEVELS) - 1:
+            self.index += 1
+        elif self.load < RESTORE_LOAD and self.index > 0:
+            self.index -= 1
+        else:
+            return False
+        self._until = now + HOLD
+        return True
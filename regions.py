@@ -0,0 +1,75 @@
+# Screen regions.
+#
+# The terminal is split into three curses windows — scene (sky, ground and
+# house), info panel and status bar — each backed by its own FrameBuffer.
+# A region is only flushed when something drew into it, every flushed window
+# is staged with noutrefresh(), and one doupdate() per frame sends the lot.
+# The info panel is redrawn only when what it shows changes, so a normal
+# frame's output is confined to the animated scene and the status line.
+# With the ANSI backend the windows are views onto an AnsiScreen and the
+# update is its single write.
+
+from __future__ import annotations
+import curses
+
+from framebuffer import FrameBuffer
+from headless import HeadlessWindow
+from ui import PANEL_ROWS, STATUS_ROWS
+
+
+class Region:
+    """One window and the buffer that is drawn into it."""
+
+    __slots__ = ("fb", "win", "dirty")
+
+    def __init__(self, h: int, w: int, y: int, headless: bool = False, term=None):
+        self.fb    = FrameBuffer(h, w)
+        if headless:
+            self.win = HeadlessWindow(h, w)
+        else:
+            self.win = (term or curses).newwin(h, w, y, 0)
+        self.dirty = True
+
+    def flush(self) -> int:
+        """Send the buffer's changes to the window and stage it; returns the write calls made."""
+        if not self.dirty:
+            return 0
+        calls = self.fb.flush(self.win)
+        self.win.noutrefresh()
+        self.dirty = False
+        return calls
+
+
+class Regions:
+    """
+    The scene, panel and status regions for an h × w terminal. `headless`
+    swaps the curses windows for HeadlessWindows (benchmarks, snapshots);
+    `term` is an AnsiScreen to draw on instead of curses.
+    """
+
+    def __init__(self, h: int, w: int, headless: bool = False, term=None):
+        self.h, self.w = h, w
+        self.headless  = headless
+        self.term      = term
+        scene_h        = h - PANEL_ROWS - STATUS_ROWS
+        self.scene     = Region(scene_h,     w, 0,               headless, term)
+        self.panel     = Region(PANEL_ROWS,  w, scene_h,         headless, term)
+        self.status    = Region(STATUS_ROWS, w, h - STATUS_ROWS, headless, term)
+        self.panel_key = None   # what the panel currently shows; see panel_changed()
+
+    def all(self) -> tuple[Region, Region, Region]:
+        return self.scene, self.panel, self.status
+
+    def panel_changed(self, key) -> bool:
+        """True (once) when the panel's content key differs from what it last showed."""
+        if key == self.panel_key:
+            return False
+        self.panel_key = key
+        return True
+
+    def flush(self) -> int:
+        """Flush the dirty regions and update the terminal once. Returns the write calls made."""
+        calls = sum(region.flush() for region in self.all())
+        if not self.headless:
+            (self.term or curses).doupdate()
+        return calls
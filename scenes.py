@@ -1,302 +1,304 @@
 # One draw function per weather type + the house renderer
 # Each scene function signature:
-#   draw_<type>_scene(win, particles, frame)
+#   draw_<type>_scene(win, particles, t)
 #
 # "particles" is a namespace so each scene only unpacks what it needs.
+# "t" is simulation time in seconds, so animation timing doesn't depend on
+# how often frames are actually drawn. "sky_height" defaults to the full-screen
+# layout (everything above the info panel); dashboard tiles pass their own.
+#
+# Scenes are split in two: draw_static_scene() paints the parts that never
+# change for a given size (sky fill, ground strip) and is cached as a layer by
+# layers.py; the draw_<type>_scene() functions paint only the moving parts on
+# top of that layer.
 
 import curses
-import math
 
-from assets import (
-    HOUSE, SUN_FRAMES,
-    STORM_CLOUD_ROWS, LIGHTNING_BOLTS,
-)
+from assets import STORM_CLOUD_ROWS
+from quality import Quality, HIGH
 from colors import (
     rain_color, ripple_color, general_color, sun_color,
-    ground_color, dim_color, house_color, snow_color,
-    flash_color
+    ground_color, dim_color, snow_color, flash_color,
 )
+from sprites import house_sprite, sun_sprites, bolt_sprites, cloud_sprite
+from tables import wave_frames, band_frames, fog_row, ripple_frames
+
+# Seconds between lightning strikes
+THUNDER_CYCLE = 4.5
+
+# Rows under the sky on a full screen: ground, info panel and status bar
+PANEL_ROWS = 14
 
 
 # House
 def draw_house(win, start_y: int, start_x: int, weather_type: str):
     """Render the ASCII house. Windows glow yellow on sunny days."""
     h, w = win.getmaxyx()
-    window_lit = curses.color_pair(4)
-    window_dim = curses.color_pair(4) | curses.A_DIM
-
-    for row, line in enumerate(HOUSE):
-        y = start_y + row
-        if y >= h - 1:
-            break
-        for col, ch in enumerate(line):
-            x = start_x + col
-            if not 0 <= x < w - 1:
-                continue
-            try:
-                if ch in r"/\|_":
-                    win.addch(y, x, ch, house_color())
-                elif ch in "[]":
-                    color = window_lit if weather_type == "sun" else window_dim
-                    win.addch(y, x, ch, color)
-                elif ch == "*":
-                    win.addch(y, x, ch, curses.color_pair(4) | curses.A_BOLD)
-                else:
-                    win.addch(y, x, ch, house_color())
-            except curses.error:
-                pass
+    house_sprite(weather_type == "sun").draw(win, start_y, start_x, h - 1, w - 1)
 
 
 # Rain
-def draw_rain_scene(win, drops: list, frame: int):
+def draw_rain_scene(win, drops, t: float, sky_height: int | None = None):
     """
     Calm drizzle: soft cyan sky, scrolling fluffy clouds,
     gentle vertical drops, expanding puddle ripples on the ground.
     """
     h, w = win.getmaxyx()
-    sky_height = h - 14
-
-    # Soft cyan sky — slightly darker at top, lighter near horizon
-    for row in range(sky_height):
-        attr = curses.A_DIM if row < sky_height // 2 else 0
-        try:
-            win.addstr(row, 0, " " * (w - 1), ripple_color() | attr)
-        except curses.error:
-            pass
+    sky_height = _sky_rows(h, sky_height)
 
     # Two scrolling cloud bands
-    _draw_scrolling_cloud_band(win, row=1, band=".-.(  ).-.  .-.(   ).  .-(    )-.  .(  ).", frame=frame // 2,   width=w)
-    _draw_scrolling_cloud_band(win, row=4, band=" '---'  '--' '----'  '--'  '---'  '--'  ", frame=frame // 3, width=w)
+    _draw_scrolling_cloud_band(win, row=1, band=".-.(  ).-.  .-.(   ).  .-(    )-.  .(  ).", step=_beat(t, 0.10), width=w)
+    _draw_scrolling_cloud_band(win, row=4, band=" '---'  '--' '----'  '--'  '---'  '--'  ", step=_beat(t, 0.15), width=w)
 
     # Rain drops — thin vertical bars, barely any wind
-    for drop in drops:
-        iy, ix = int(drop.y), int(drop.x)
-        if 0 <= iy < sky_height and 0 <= ix < w - 1:
-            try:
-                win.addch(iy, ix, ord("|"), rain_color())
-            except curses.error:
-                pass
+    color = rain_color()
+    for iy, ix, _ in drops.visible(sky_height, w - 1):
+        try:
+            win.addch(iy, ix, ord("|"), color)
+        except curses.error:
+            pass
 
-    # Puddle ripples cycling . -> o -> O -> o -> .
-    ground_y   = sky_height
-    ripple_seq = [".", "o", "O", "o", "."]
-    for col in range(3, w - 3, 9):
-        phase = (frame + col * 3) // 6 % len(ripple_seq)
+    # Puddle ripples cycling . -> o -> O -> o -> . (one stage per 0.3 s, staggered by column)
+    ground_y = sky_height
+    ripples  = ripple_frames(w)
+    bright   = ripple_color() | curses.A_BOLD
+    soft     = rain_color()
+    for col, ch in ripples[_beat(t, 0.15) % len(ripples)]:
         try:
-            win.addstr(ground_y, col, ripple_seq[phase], ripple_color() | curses.A_BOLD)
+            win.addstr(ground_y, col, ch, bright)
             if col + 2 < w - 1:
-                win.addstr(ground_y, col + 2, ripple_seq[phase], rain_color())
+                win.addstr(ground_y, col + 2, ch, soft)
         except curses.error:
             pass
 
 
 # Thunder
-def draw_thunder_scene(win, drops: list, frame: int):
+def draw_thunder_scene(win, drops, t: float, sky_height: int | None = None,
+                       streaks: bool = True, flash: bool = True):
     """
     Violent storm: near-black sky, heavy storm cloud bands, diagonal slashing rain,
     periodic full-screen lightning flash, jagged bolt strike, screen shake, flood water.
+    At lower detail the rain loses its second streak row and the flash only
+    brightens the rain instead of filling the sky.
     """
     h, w = win.getmaxyx()
-    sky_height = h - 14
+    sky_height = _sky_rows(h, sky_height)
 
-    # Timing windows within an 90-frame (~4.5 s) cycle
-    cycle    = frame % 90
-    is_flash = cycle < 4
-    is_bolt  = cycle < 6
-    shake    = 1 if (cycle < 3 and frame % 2 == 0) else 0   # 1 row shake during strike
+    # Timing windows within a 4.5 s strike cycle
+    strike   = _beat(t, THUNDER_CYCLE)
+    cycle    = t - strike * THUNDER_CYCLE
+    is_flash = cycle < 0.2
+    is_bolt  = cycle < 0.3
+    shake    = 1 if (cycle < 0.15 and _beat(t, 0.05) % 2 == 0) else 0   # 1 row shake during strike
 
-    # Sky background
-    if is_flash:
+    # Lightning flash paints over the cached night sky
+    if is_flash and flash:
         for row in range(sky_height):
             try:
                 win.addstr(row + shake, 0, "░" * (w - 1), flash_color())
             except curses.error:
                 pass
-    else:
-        for row in range(sky_height):
-            try:
-                win.addstr(row, 0, " " * (w - 1), rain_color() | curses.A_DIM)
-            except curses.error:
-                pass
 
     # Heavy storm cloud bands across the top
     for ci, band in enumerate(STORM_CLOUD_ROWS):
         row   = ci + shake
         if not 0 <= row < sky_height:
             continue
-        offset  = (frame // 4 + ci * 7) % len(band)
-        segment = (band * 2)[offset: offset + w - 1]
-        attr    = curses.A_DIM if ci == 2 else 0
+        frames = band_frames(band, w)
+        attr   = curses.A_DIM if ci == 2 else 0
         try:
-            win.addstr(row, 0, segment, dim_color() | attr)
+            win.addstr(row, 0, frames[(_beat(t, 0.2) + ci * 7) % len(frames)], dim_color() | attr)
         except curses.error:
             pass
 
     # Lightning bolt strike
     if is_bolt:
-        bolt   = LIGHTNING_BOLTS[(frame // 90) % len(LIGHTNING_BOLTS)]
-        bolt_x = (w // 3) + ((frame // 90 * 17) % (w // 2))
+        bolts  = bolt_sprites()
+        bolt   = bolts[strike % len(bolts)]
+        bolt_x = (w // 3) + ((strike * 17) % (w // 2))
         bolt_y = len(STORM_CLOUD_ROWS) + 1 + shake
-        for bi, line in enumerate(bolt):
-            by = bolt_y + bi
-            bx = min(bolt_x, w - len(line) - 1)
-            if 0 <= by < sky_height:
-                try:
-                    win.addstr(by, bx, line, curses.color_pair(4) | curses.A_BOLD)
-                except curses.error:
-                    pass
+        bolt.draw(win, bolt_y, min(bolt_x, w - bolt.width - 1), sky_height, w - 1)
 
     # Heavy diagonal rain "/" chars, fast, dense, double-height streaks
-    for drop in drops:
-        iy, ix = int(drop.y) + shake, int(drop.x)
-        ch     = "/" if int(drop.x * 7) % 3 != 0 else "|"
-        color  = general_color() | curses.A_BOLD if is_flash else rain_color()
-        if 0 <= iy < sky_height and 0 <= ix < w - 1:
+    color  = general_color() | curses.A_BOLD if is_flash else rain_color()
+    streak = rain_color() | curses.A_DIM
+    for iy, ix, x in drops.visible(sky_height, w - 1):
+        iy += shake
+        ch  = "/" if int(x * 7) % 3 != 0 else "|"
+        if iy < sky_height:
             try:
                 win.addch(iy, ix, ord(ch), color)
             except curses.error:
                 pass
-        if 0 <= iy + 1 < sky_height and 0 <= ix < w - 1:
+        if streaks and iy + 1 < sky_height:
             try:
-                win.addch(iy + 1, ix, ord("/"), rain_color() | curses.A_DIM)
+                win.addch(iy + 1, ix, ord("/"), streak)
             except curses.error:
                 pass
 
     # Animated flood water on ground
     ground_y = sky_height
-    wave     = "".join(["~", "~", "≈", "~", "~", "≈"][(col + frame // 2) % 6] for col in range(w - 1))
+    waves    = wave_frames(w)
+    wave     = waves[_beat(t, 0.1) % len(waves)]
     try:
         win.addstr(ground_y, 0, wave, rain_color() | curses.A_BOLD)
     except curses.error:
         pass
-    if ground_y + 1 < h - 1:
-        try:
-            win.addstr(ground_y + 1, 0, "░" * (w - 1), rain_color() | curses.A_DIM)
-        except curses.error:
-            pass
 
 
 # Snow
-def draw_snow_scene(win, flakes: list):
+def draw_snow_scene(win, flakes, sky_height: int | None = None):
     """Cold, quiet snowfall with gentle side-drifting flakes and a snow ground line."""
     h, w = win.getmaxyx()
-    sky_height = h - 14
+    sky_height = _sky_rows(h, sky_height)
 
-    # Cold white-gray sky
-    for row in range(sky_height):
+    # Snowflakes
+    color = snow_color()
+    for iy, ix, ch in flakes.visible(sky_height, w - 1):
+        if ord(ch) >= 128:
+            ch = "*"
         try:
-            win.addstr(row, 0, " " * (w - 1), general_color() | curses.A_DIM)
+            win.addch(iy, ix, ord(ch), color)
         except curses.error:
             pass
 
-    # Snowflakes
-    for flake in flakes:
-        iy, ix = int(flake.y), int(flake.x)
-        if 0 <= iy < sky_height and 0 <= ix < w - 1:
-            ch = flake.char if ord(flake.char) < 128 else "*"
-            try:
-                win.addch(iy, ix, ord(ch), snow_color())
-            except curses.error:
-                pass
-
-    # Snow accumulation line
-    try:
-        win.addstr(sky_height, 0, "~*~*~*~*~" * (w // 9 + 1), snow_color())
-    except curses.error:
-        pass
-
 
 # Sun
-def draw_sun_scene(win, clouds: list, frame: int, _weather_data):
+def draw_sun_scene(win, clouds: list, t: float, _weather_data, sky_height: int | None = None):
     """Bright sunny sky with a rotating sun, a few drifting clouds, and green grass."""
     h, w = win.getmaxyx()
-    sky_height = h - 14
-
-    # Bright yellow tinted sky
-    for row in range(sky_height):
-        try:
-            win.addstr(row, 0, " " * (w - 1), sun_color() | curses.A_DIM)
-        except curses.error:
-            pass
+    sky_height = _sky_rows(h, sky_height)
 
-    # Rotating sun (3 frame animation, changes every 15 frames)
-    sun_frame = SUN_FRAMES[(frame // 15) % len(SUN_FRAMES)]
-    sun_x     = max(0, w // 2 - 10)
-    for i, line in enumerate(sun_frame):
-        sy = 3 + i
-        if 0 <= sy < sky_height:
-            try:
-                win.addstr(sy, sun_x, line, sun_color())
-            except curses.error:
-                pass
+    # Rotating sun (3 frame animation, changes every 0.75 s)
+    suns = sun_sprites()
+    suns[_beat(t, 0.75) % len(suns)].draw(win, 3, max(0, w // 2 - 10), sky_height, w - 1)
 
     # A couple of lazy clouds drifting across
     for cloud in clouds:
         _draw_cloud(win, cloud, sky_height, w, general_color() | curses.A_BOLD)
 
-    # Green grass ground
-    try:
-        win.addstr(sky_height, 0, "^" * (w - 1), ground_color())
-    except curses.error:
-        pass
-
 
 # Cloud
-def draw_cloud_scene(win, clouds: list):
+def draw_cloud_scene(win, clouds: list, sky_height: int | None = None):
     """Overcast sky packed with slow-moving clouds."""
     h, w = win.getmaxyx()
-    sky_height = h - 14
+    sky_height = _sky_rows(h, sky_height)
 
-    # Gray overcast sky
-    for row in range(sky_height):
+    for cloud in clouds:
+        _draw_cloud(win, cloud, sky_height, w, dim_color() | curses.A_BOLD)
+
+
+# Fog
+def draw_fog_scene(win, t: float, sky_height: int | None = None, row_stride: int = 1):
+    """Dense fog using block characters, on every `row_stride`-th row."""
+    h, w = win.getmaxyx()
+    sky_height = _sky_rows(h, sky_height)
+
+    # Every row is the same run of ░, whatever its offset, so it is built once per width
+    fog = fog_row(w)
+    for row in range(0, sky_height, row_stride):
         try:
-            win.addstr(row, 0, " " * (w - 1), dim_color() | curses.A_DIM)
+            win.addstr(row, 0, fog, dim_color() | curses.A_DIM)
         except curses.error:
             pass
 
-    for cloud in clouds:
-        _draw_cloud(win, cloud, sky_height, w, dim_color() | curses.A_BOLD)
 
+# Any weather type
+def draw_scene(win, wtype: str, particles: dict, t: float, weather_data: dict,
+               sky_height: int | None = None, level: Quality = HIGH):
+    """Route to the correct scene renderer based on weather type."""
+    drops  = particles["drops"]
+    flakes = particles["flakes"]
+    clouds = particles["clouds"]
 
-# Fog
-def draw_fog_scene(win, frame: int):
-    """Dense scrolling fog using block characters."""
+    scene_map = {
+        "rain":    lambda: draw_rain_scene(win, drops, t, sky_height),
+        "thunder": lambda: draw_thunder_scene(win, drops, t, sky_height, level.streaks, level.flash),
+        "snow":    lambda: draw_snow_scene(win, flakes, sky_height),
+        "sun":     lambda: draw_sun_scene(win, clouds[:2], t, weather_data, sky_height),
+        "cloud":   lambda: draw_cloud_scene(win, clouds, sky_height),
+        "fog":     lambda: draw_fog_scene(win, t, sky_height, level.fog_stride),
+    }
+    scene_map.get(wtype, scene_map["sun"])()
+
+
+def _sky_rows(h: int, sky_height: int | None) -> int:
+    """Rows of sky above the ground line; full-screen scenes leave PANEL_ROWS for the panel."""
+    return h - PANEL_ROWS if sky_height is None else sky_height
+
+
+def _beat(t: float, every: float) -> int:
+    """How many whole `every`-second beats fit into t (epsilon guards float steps)."""
+    return int(t / every + 1e-9)
+
+
+# Static backgrounds
+def draw_static_scene(win, weather_type: str, sky_height: int | None = None):
+    """Paint the parts of a scene that only depend on its size: sky fill and ground strip."""
     h, w = win.getmaxyx()
-    sky_height = h - 14
-    t = frame * 0.02
+    sky_height = _sky_rows(h, sky_height)
 
+    sky, ground = _STATIC_PARTS.get(weather_type, _STATIC_PARTS["sun"])
     for row in range(sky_height):
-        # Slightly wavy horizontal density
-        offset = int(math.sin(t + row * 0.3) * 3)
-        fog    = ("░" * (w + abs(offset)))[abs(offset): abs(offset) + w - 1]
         try:
-            win.addstr(row, 0, fog, dim_color() | curses.A_DIM)
+            win.addstr(row, 0, " " * (w - 1), sky(row, sky_height))
         except curses.error:
             pass
+    if ground:
+        ground(win, sky_height, w)
 
 
-# Private helpers
-def _draw_cloud(win, cloud, sky_height: int, w: int, color):
-    """Render a single Cloud object onto the window."""
-    for ci, line in enumerate(cloud.shape):
-        cy = int(cloud.y) + ci
-        cx = int(cloud.x)
-        if cy >= sky_height or cy < 0:
-            continue
-        if cx < 0:
-            line = line[min(abs(cx), len(line)):]
-            cx   = 0
-        if cx + len(line) >= w:
-            line = line[:w - 1 - cx]
+def _snow_ground(win, sky_height: int, w: int):
+    try:
+        win.addstr(sky_height, 0, "~*~*~*~*~" * (w // 9 + 1), snow_color())
+    except curses.error:
+        pass
+
+
+def _grass_ground(win, sky_height: int, w: int):
+    try:
+        win.addstr(sky_height, 0, "^" * (w - 1), ground_color())
+    except curses.error:
+        pass
+
+
+def _flood_ground(win, sky_height: int, w: int):
+    # Only the murky second row is static; the wave line above it animates
+    h, _ = win.getmaxyx()
+    if sky_height + 1 < h - 1:
         try:
-            win.addstr(cy, cx, line, color)
+            win.addstr(sky_height + 1, 0, "░" * (w - 1), rain_color() | curses.A_DIM)
         except curses.error:
             pass
 
 
-def _draw_scrolling_cloud_band(win, row: int, band: str, frame: int, width: int):
-    """Tile a cloud band string and scroll it horizontally over time."""
-    offset  = frame % len(band)
+# weather type -> (sky attr for a row, ground painter or None)
+_STATIC_PARTS = {
+    # Soft cyan sky — slightly darker at top, lighter near horizon
+    "rain":    (lambda row, sky_h: ripple_color() | (curses.A_DIM if row < sky_h // 2 else 0), None),
+    # Near-black storm sky
+    "thunder": (lambda row, sky_h: rain_color() | curses.A_DIM,    _flood_ground),
+    # Cold white-gray sky
+    "snow":    (lambda row, sky_h: general_color() | curses.A_DIM, _snow_ground),
+    # Bright yellow tinted sky
+    "sun":     (lambda row, sky_h: sun_color() | curses.A_DIM,     _grass_ground),
+    # Gray overcast sky
+    "cloud":   (lambda row, sky_h: dim_color() | curses.A_DIM,     None),
+    # Fog is drawn over a plain background
+    "fog":     (lambda row, sky_h: 0,                              None),
+}
+
+
+# Private helpers
+def _draw_cloud(win, cloud, sky_height: int, w: int, color):
+    """Render a single Cloud object onto the window."""
+    sprite = cloud_sprite(tuple(cloud.shape), color)
+    sprite.draw(win, int(cloud.y), int(cloud.x), sky_height, w - 1)
+
+
+def _draw_scrolling_cloud_band(win, row: int, band: str, step: int, width: int):
+    """Tile a cloud band string and scroll it horizontally, one column per step."""
+    offset  = step % len(band)
     segment = (band * 3)[len(band) - offset:]
     try:
         win.addstr(row, 0, segment[:width - 1], general_color() | curses.A_BOLD)
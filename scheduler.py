@@ -0,0 +1,149 @@
+# Frame pacing and simulation time.
+#
+# Frames are paced against absolute deadlines on time.perf_counter(), so the
+# loop sleeps only for whatever is left of the frame period and never drifts
+# with render cost. When a frame overruns, the following frames skip drawing
+# until the loop has caught up.
+#
+# The simulation runs on its own fixed-timestep clock: however often frames
+# are drawn, the world advances in SIM_DT steps of real time.
+
+from __future__ import annotations
+import math
+import time
+
+from keys import read_key
+
+# Never skip more than this many renders in a row, even when far behind
+MAX_SKIP = 5
+
+# Further behind than this (seconds) and we stop trying to catch up
+MAX_LAG = 0.25
+
+# Adaptive mode: fraction of the frame budget spent working (smoothed) above
+# which we render less often, and below which we try rendering more often again
+OVERLOAD   = 0.90
+UNDERLOAD  = 0.50
+EMA_WEIGHT = 0.1
+MIN_FPS    = 5
+
+# Simulation step rate. Particle speeds are tuned per step at this rate.
+SIM_HZ = 20
+SIM_DT = 1.0 / SIM_HZ
+
+# Cap on steps simulated in one frame after a stall (suspend, debugger, ...)
+MAX_STEPS = 10
+
+
+class FrameScheduler:
+    """
+    Deadline-based pacing for the main loop.
+
+    render_due tells the caller whether the current frame should be drawn. In
+    adaptive mode only every `decimation`-th frame is drawn, and the decimation
+    follows the measured load.
+    """
+
+    def __init__(self, fps: int, adaptive: bool = False):
+        self.fps        = fps
+        self.period     = 1.0 / fps
+        self.adaptive   = adaptive
+        self.decimation = 1
+        self.load       = 0.0          # smoothed busy fraction of the frame budget
+        self.busy       = 0.0          # busy fraction of the last drawn frame
+        self.render_due = True
+
+        self._deadline  = time.perf_counter()   # first frame is due right away
+        self._started   = 0.0
+        self._skipped   = 0
+        self._tick      = 0
+
+    @property
+    def render_fps(self) -> float:
+        """Frames actually drawn per second at the current decimation."""
+        return self.fps / self.decimation
+
+    def retarget(self, fps: int):
+        """Change the frame rate (idle mode); going faster makes the next frame due sooner."""
+        self.fps       = fps
+        self.period    = 1.0 / fps
+        self._deadline = min(self._deadline, time.perf_counter() + self.period)
+
+    def wait(self, win) -> int:
+        """
+        Block in win.getch() until the current deadline. Returns a key as soon
+        as one is pressed, or -1 once it's time to run the frame.
+        """
+        left = self._deadline - time.perf_counter()
+        if left <= 0:
+            return -1
+        win.timeout(max(1, math.ceil(left * 1000)))
+        key = read_key(win)
+        if key == -1 and time.perf_counter() < self._deadline:
+            return self.wait(win)   # woke a hair early
+        return key
+
+    def begin_frame(self):
+        """Advance to the next deadline and decide whether this frame is drawn."""
+        now  = time.perf_counter()
+        lag  = now - self._deadline
+        self._started   = now
+        self._tick     += 1
+        self._deadline += self.period
+
+        if lag > MAX_LAG:
+            # Hopelessly behind (suspended, debugger, huge hiccup): resync
+            self._deadline = now + self.period
+            lag = 0.0
+
+        behind = lag > self.period and self._skipped < MAX_SKIP
+        if behind or self._tick % self.decimation:
+            self.render_due = False
+            self._skipped  += behind
+        else:
+            self.render_due = True
+            self._skipped   = 0
+
+    def end_frame(self):
+        """Record how long the frame's work took (adaptive mode and the quality governor feed on this)."""
+        if not self.render_due:
+            return
+        self.busy = (time.perf_counter() - self._started) / (self.period * self.decimation)
+        if not self.adaptive:
+            return
+        self.load = self.load + EMA_WEIGHT * (self.busy - self.load)
+
+        if self.load > OVERLOAD and self.render_fps / 2 >= MIN_FPS:
+            self.decimation *= 2
+            self.load        = UNDERLOAD    # give the new rate time to settle
+        elif self.load < UNDERLOAD / 2 and self.decimation > 1:
+            self.decimation //= 2
+            self.load         = UNDERLOAD
+
+
+class SimClock:
+    """Fixed-timestep clock: feeds real elapsed time in, hands whole SIM_DT steps out."""
+
+    def __init__(self):
+        self.steps  = 0
+        # Start half a step in, so when frames and steps share a rate the step
+        # boundaries fall mid-frame and jitter doesn't give 0-then-2 steps
+        self._acc   = SIM_DT / 2
+        self._last  = time.perf_counter()
+
+    @property
+    def t(self) -> float:
+        """Simulation time in seconds."""
+        return self.steps / SIM_HZ
+
+    def advance(self) -> int:
+        """Return how many steps to simulate for the real time elapsed since last call."""
+        now        = time.perf_counter()
+        self._acc += now - self._last
+        self._last = now
+
+        steps      = int(self._acc / SIM_DT)
+        self._acc -= steps * SIM_DT
+        steps      = min(steps, MAX_STEPS)
+        self.steps += steps
+        return steps
@@ -0,0 +1,74 @@
+# One-shot snapshots.
+#
+# `nimbus --once` renders a single frame — the scene and the info panel, no
+# status bar — into headless buffers and prints it, for login MOTDs, CI
+# dashboards and tmux status scripts. No curses, no TTY, no event loop: the
+# weather comes from the cache when it's fresh (one file read) or from one
+# blocking fetch, and the particles are stepped forward headlessly first so
+# the picture looks like a running scene rather than its first frame.
+
+from __future__ import annotations
+import shutil
+
+from ansi import frame_lines
+from cache import WeatherCache, DEFAULT_TTL
+from fetcher import fetch_with_cache
+from layers import build_static_layer
+from particles import spawn_particles, update_particles
+from regions import Regions
+from scenes import draw_scene
+from scheduler import SIM_DT
+from sprites import compile_all
+from ui import draw_info_panel
+from weather import make_demo_data
+
+# Smallest layout that fits the house and the info cards
+MIN_W = 50
+MIN_H = 20
+
+# Simulation steps run before the snapshot, per screen row: enough for rain
+# and snow that start above the screen to have filled the sky
+WARMUP_PER_ROW = 2
+
+
+def snapshot_size() -> tuple[int, int]:
+    """(h, w) to render at: the terminal's size, $LINES/$COLUMNS, or 80×24, at least MIN_W×MIN_H."""
+    cols, rows = shutil.get_terminal_size((80, 24))
+    return max(MIN_H, rows), max(MIN_W, cols)
+
+
+def snapshot(city: str | None, demo_mode: str | None = None, style: str = "text",
+             cache_ttl: float = DEFAULT_TTL, use_cache: bool = True, lean: bool = False,
+             size: tuple[int, int] | None = None) -> str:
+    """One frame for `city` as text (`style` "text") or with ANSI colors ("ansi")."""
+    if demo_mode:
+        data = make_demo_data(demo_mode)
+    else:
+        cache = WeatherCache(ttl=cache_ttl) if use_cache else None
+        data  = fetch_with_cache(city, cache, lean=lean)
+    wtype = data.get("type", "sun") if "error" not in data else "sun"
+
+    compile_all()
+    h, w      = size or snapshot_size()
+    regions   = Regions(h, w, headless=True)
+    scene     = regions.scene.fb
+    particles = spawn_particles(w, h)
+    steps     = WARMUP_PER_ROW * h
+    for _ in range(steps):
+        update_particles(particles, wtype)
+
+    layer = build_static_layer(wtype, h, w)
+    scene.blit(layer.base)
+    draw_scene(scene, wtype, particles, steps * SIM_DT, data, sky_height=scene.h - 1)
+    scene.draw_runs(layer.overlay)
+    draw_info_panel(regions.panel.fb, data, 0.0, interactive=False)
+
+    lines, rows = [], []
+    for fb in (scene, regions.panel.fb):
+        lines += frame_lines(fb) if style == "ansi" else ["".join(chars).rstrip() for chars in fb.chars]
+        rows  += fb.chars
+    # Drop the empty rows under the cards
+    while rows and not "".join(rows[-1]).strip():
+        rows.pop()
+        lines.pop()
+    return "\n".join(lines)
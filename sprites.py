@@ -0,0 +1,128 @@
+# Compiled sprites.
+#
+# The raw string assets are turned into (row, col, text, attr) runs once, with
+# every cell's color already resolved and the transparent margin around each
+# row dropped. Drawing a sprite is then one addstr per run instead of one
+# addch (plus a color lookup) per character.
+
+from __future__ import annotations
+import curses
+from functools import lru_cache
+
+from assets import HOUSE, SUN_FRAMES, LIGHTNING_BOLTS
+from colors import house_color, sun_color, flash_color, window_color
+
+# Placements remembered per sprite before the memo is reset (clouds drift slowly,
+# so the same few positions come up frame after frame)
+_PLACEMENT_MEMO = 64
+
+
+class Sprite:
+    """An asset compiled to (row, col, text, attr) runs relative to its top-left corner."""
+
+    def __init__(self, runs: list[tuple[int, int, str, int]], height: int, width: int):
+        self.runs    = runs
+        self.height  = height
+        self.width   = width
+        self._placed: dict[tuple, list] = {}
+
+    def place(self, y: int, x: int, rows: int, cols: int) -> list[tuple[int, int, str, int]]:
+        """Absolute runs for the sprite at (y, x), clipped to rows × cols."""
+        key    = (y, x, rows, cols)
+        placed = self._placed.get(key)
+        if placed is not None:
+            return placed
+
+        placed = []
+        for ry, rx, text, attr in self.runs:
+            sy, sx = y + ry, x + rx
+            if not 0 <= sy < rows or sx >= cols:
+                continue
+            if sx < 0:
+                text, sx = text[-sx:], 0
+            text = text[:cols - sx]
+            if text:
+                placed.append((sy, sx, text, attr))
+
+        if len(self._placed) >= _PLACEMENT_MEMO:
+            self._placed.clear()
+        self._placed[key] = placed
+        return placed
+
+    def draw(self, win, y: int, x: int, rows: int, cols: int):
+        """Draw onto a window, clipped to its top `rows` rows and left `cols` columns."""
+        for sy, sx, text, attr in self.place(y, x, rows, cols):
+            try:
+                win.addstr(sy, sx, text, attr)
+            except curses.error:
+                pass
+
+
+def compile_sprite(lines: list[str], attr_of) -> Sprite:
+    """
+    Compile ASCII art into a Sprite. `attr_of(ch)` gives each visible character's
+    attribute; spaces outside a row's outline are transparent, inner ones are kept.
+    """
+    runs = []
+    for row, line in enumerate(lines):
+        body = line.strip(" ")
+        if not body:
+            continue
+        col   = len(line) - len(line.lstrip(" "))
+        start = col
+        attr  = attr_of(body[0])
+        for i, ch in enumerate(body):
+            a = attr_of(ch)
+            if a != attr:
+                runs.append((row, start, body[start - col:i], attr))
+                start, attr = col + i, a
+        runs.append((row, start, body[start - col:], attr))
+    return Sprite(runs, len(lines), max((len(line) for line in lines), default=0))
+
+
+def solid_sprite(lines: tuple[str, ...], attr: int) -> Sprite:
+    """Compile a single-color sprite."""
+    return compile_sprite(list(lines), lambda ch: attr)
+
+
+# Compiled assets (built once, on first use)
+
+@lru_cache(maxsize=None)
+def house_sprite(lit: bool) -> Sprite:
+    """The house; windows glow yellow when `lit` (sunny days)."""
+    window = window_color() | (0 if lit else curses.A_DIM)
+    light  = window_color() | curses.A_BOLD
+    walls  = house_color()
+
+    def attr_of(ch):
+        if ch in "[]":
+            return window
+        if ch == "*":
+            return light
+        return walls
+
+    return compile_sprite(HOUSE, attr_of)
+
+
+@lru_cache(maxsize=None)
+def sun_sprites() -> tuple[Sprite, ...]:
+    return tuple(solid_sprite(tuple(f), sun_color()) for f in SUN_FRAMES)
+
+
+@lru_cache(maxsize=None)
+def bolt_sprites() -> tuple[Sprite, ...]:
+    attr = flash_color()
+    return tuple(solid_sprite(tuple(b), attr) for b in LIGHTNING_BOLTS)
+
+
+@lru_cache(maxsize=32)
+def cloud_sprite(shape: tuple[str, ...], attr: int) -> Sprite:
+    return solid_sprite(shape, attr)
+
+
+def compile_all():
+    """Compile the fixed assets up front so the first frame doesn't pay for it."""
+    house_sprite(True)
+    house_sprite(False)
+    sun_sprites()
+    bolt_sprites()
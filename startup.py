@@ -0,0 +1,34 @@
+# Startup timeline.
+#
+# main.py and the render loops mark milestones (imports done, curses up,
+# first frame on screen) against the moment main.py started loading;
+# --startup-trace prints them on exit. A mark is one list append, so the
+# calls stay in unconditionally.
+
+from __future__ import annotations
+import sys
+import time
+
+_T0 = time.perf_counter()
+_marks: list[tuple[str, float]] = []
+
+
+def mark(label: str):
+    """Record `label` as having happened now."""
+    _marks.append((label, time.perf_counter() - _T0))
+
+
+def mark_once(label: str):
+    """Like mark(), but only the first time (for marks inside the frame loop)."""
+    if not any(seen == label for seen, _ in _marks):
+        mark(label)
+
+
+def report() -> str:
+    """The timeline as text, one milestone per line, plus which heavy modules got loaded."""
+    lines = ["Startup trace (ms since main.py started):"]
+    for label, secs in _marks:
+        lines.append(f"  {secs * 1000:8.1f}  {label}")
+    heavy = [name for name in ("requests", "urllib3", "numpy") if name in sys.modules]
+    lines.append(f"  modules loaded: {', '.join(heavy) or 'none of requests/urllib3/numpy'}")
+    return "\n".join(lines)
@@ -0,0 +1,53 @@
+# Animation tables.
+#
+# The flood wave, the storm cloud bands, the fog rows and the puddle ripples
+# are periodic: after a few beats they repeat exactly. Every frame of one
+# period is built once per width (and band) and kept here, so drawing them is
+# a lookup by beat instead of rebuilding strings column by column. The caches
+# are bounded; resizing through many widths only keeps the recent ones.
+
+from __future__ import annotations
+from functools import lru_cache
+
+# Widths kept per table before the least recently used is dropped
+TABLE_CACHE_SIZE = 8
+
+# Flood water, one column per 0.1 s beat
+WAVE = "~~≈~~≈"
+
+# Puddle ripple stages; a puddle every 9 columns from column 3, each one
+# half a stage ahead of its left neighbour
+RIPPLE_SEQ    = ".oOo."
+RIPPLE_FIRST  = 3
+RIPPLE_SPACE  = 9
+RIPPLE_PERIOD = 2 * len(RIPPLE_SEQ)     # half-stage beats before it repeats
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def wave_frames(w: int) -> tuple[str, ...]:
+    """The flood wave line for each beat of its period, `w - 1` columns wide."""
+    line = WAVE * ((w - 1) // len(WAVE) + 2)
+    return tuple(line[step: step + w - 1] for step in range(len(WAVE)))
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE * 4)
+def band_frames(band: str, w: int) -> tuple[str, ...]:
+    """A storm cloud band scrolled by each offset, as drawn on a `w` wide screen."""
+    double = band * 2
+    return tuple(double[offset: offset + w - 1] for offset in range(len(band)))
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def fog_row(w: int) -> str:
+    """One full-width row of fog."""
+    return "░" * (w - 1)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def ripple_frames(w: int) -> tuple[tuple[tuple[int, str], ...], ...]:
+    """(column, stage char) of every puddle for each half-stage beat of the period."""
+    cols = range(RIPPLE_FIRST, w - 3, RIPPLE_SPACE)
+    return tuple(
+        tuple((col, RIPPLE_SEQ[(beat + col) // 2 % len(RIPPLE_SEQ)]) for col in cols)
+        for beat in range(RIPPLE_PERIOD)
+    )
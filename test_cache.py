@@ -0,0 +1,34 @@
+# WeatherCache shared between panes: one file, several instances.
+
+from __future__ import annotations
+import os
+import tempfile
+import unittest
+
+from cache import WeatherCache
+
+LONDON = {"temp_c": 12, "desc": "Light rain"}
+
+
+class SharedCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp       = tempfile.TemporaryDirectory()
+        self.path = os.path.join(tmp.name, "weather.json")
+        self.addCleanup(tmp.cleanup)
+
+    def test_sees_entries_written_by_another_pane(self):
+        a, b = WeatherCache(self.path), WeatherCache(self.path)
+        self.assertIsNone(a.fresh("london"))      # a has read (and kept) the empty file
+        b.put("london", LONDON)
+        self.assertEqual(a.fresh("london"), LONDON)
+
+    def test_sees_the_location_another_pane_resolved(self):
+        a, b = WeatherCache(self.path), WeatherCache(self.path)
+        self.assertIsNone(a.location())
+        b.put_location("London")
+        self.assertEqual(a.key_for(None), "london")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# RefreshSchedule timing, on a fake monotonic clock and without jitter.
+
+from __future__ import annotations
+import unittest
+from unittest import mock
+
+import fetcher
+from fetcher import RefreshSchedule
+
+GOOD = {"temp_c": 20}
+
+
+class RefreshScheduleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patches  = [
+            mock.patch.object(fetcher.time, "monotonic", lambda: self.now),
+            mock.patch.object(fetcher.random, "uniform", lambda a, b: 0.0),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_offset_survives_a_first_fetch(self):
+        # No cached data: every tile fetches at once, and the stagger must
+        # carry over to the refresh that follows
+        schedules = [RefreshSchedule(600, offset=offset) for offset in (0, 150, 300, 450)]
+        for schedule in schedules:
+            schedule.started()
+            schedule.done(GOOD)
+        self.assertEqual([s.next_due - self.now for s in schedules], [600, 750, 900, 1050])
+
+        # ...and only to that one
+        self.now = 2100.0
+        for schedule in schedules:
+            self.assertTrue(schedule.due())
+            schedule.started()
+            schedule.done(GOOD)
+        self.assertEqual([s.next_due - self.now for s in schedules], [600] * 4)
+
+    def test_offset_first_refresh_is_not_delayed_twice(self):
+        schedule = RefreshSchedule(600, age=600, offset=150)
+        self.assertEqual(schedule.next_due - self.now, 150)
+        self.now += 150
+        schedule.started()
+        schedule.done(GOOD)
+        self.assertEqual(schedule.next_due - self.now, 600)
+
+    def test_failures_back_off(self):
+        schedule = RefreshSchedule(600)
+        delays   = []
+        for _ in range(3):
+            schedule.started()
+            schedule.done({"error": "offline"})
+            delays.append(schedule.next_due - self.now)
+        self.assertEqual(delays, [30, 60, 120])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,22 +1,27 @@
 from __future__ import annotations
 import curses
+import time
 from assets import WEATHER_ASCII_LABELS
 from colors import (
     title_color, general_color, rain_color, sun_color,
     ground_color, dim_color, error_color, status_color,
 )
 
+# Rows of the info panel (separator, header, cards) and of the status bar under it
+PANEL_ROWS  = 12
+STATUS_ROWS = 1
+
 
 # Loading screen
-def draw_loading(win, frame: int):
+def draw_loading(win, t: float):
     """Centered splash screen shown while weather data is being fetched."""
     h, w    = win.getmaxyx()
     cx, cy  = w // 2, h // 2
     title   = "  Nimbus  "
-    spinner = "|/-\\"[frame // 3 % 4]
+    spinner = "|/-\\"[int(t / 0.15) % 4]
 
     try:
-        win.clear()
+        win.erase()
         win.addstr(cy - 3, cx - len(title) // 2, "╔" + "═" * len(title) + "╗", sun_color())
         win.addstr(cy - 2, cx - len(title) // 2, "║" + title               + "║", sun_color())
         win.addstr(cy - 1, cx - len(title) // 2, "╚" + "═" * len(title) + "╝", sun_color())
@@ -26,47 +31,110 @@ def draw_loading(win, frame: int):
         pass
 
 
+# Status bar key help: what works in the view the bar belongs to
+KEY_HELP          = "[R] Refresh  [P] Profiler  [Q] Quit"
+KEY_HELP_FORECAST = "[R] Refresh  [←→] Forecast  [P] Profiler  [Q] Quit"
+
+
 # Status bar
-def draw_status_bar(win, frame: int):
-    """Single-line status bar pinned to the bottom of the screen."""
-    h, w = win.getmaxyx()
-    text = f" [R] Refresh  [Q] Quit  |  Nimbus v1.0  |  Frame: {frame} "
+def draw_status_bar(win, frame: int, quality: str | None = None, keys: str = KEY_HELP):
+    """
+    Single-line status bar pinned to the bottom of the screen. On narrow
+    terminals the key help is cut, not the live quality level and frame count.
+    """
+    h, w  = win.getmaxyx()
+    left  = f" {keys}  |  Nimbus v1.0  "
+    right = f"|  Frame: {frame} "
+    if quality:
+        right = f"|  Quality: {quality}  " + right
+    room  = w - 1 - len(right)
+    if len(left) > room:
+        left = left[:max(0, room)].rsplit("  ", 1)[0] + "  "
+    text  = left + right
     try:
         win.addstr(h - 1, 0, text[:w - 1].ljust(w - 1), status_color())
     except curses.error:
         pass
 
 
+# Profiler overlay
+def draw_hud(win, lines: list[str]):
+    """Boxed overlay in the top-right corner listing live profiler stats."""
+    h, w   = win.getmaxyx()
+    card_w = max(len(line) for line in lines) + 4
+    draw_card(win, 0, max(0, w - card_w - 1), card_w,
+              [(f" {line}", status_color()) for line in lines])
+
+
 # Info panel
-def draw_info_panel(win, weather_data: dict | None, frame: int):
+def draw_info_panel(win, weather_data: dict | None, t: float, interactive: bool = True):
     """
-    Draws the panel occupying the bottom ~13 rows of the screen.
-    Shows either a loading indicator, an error message, or three info cards.
+    Draws the panel occupying the bottom PANEL_ROWS rows of `win` (all of
+    the panel window). Shows either a loading indicator, an error message,
+    or three info cards. Key hints are left out unless `interactive`.
     """
     h, w      = win.getmaxyx()
-    panel_top = h - 13
+    panel_top = h - PANEL_ROWS
 
-    # Separator line
-    try:
-        win.addstr(panel_top, 0, "─" * (w - 1), sun_color())
-    except curses.error:
-        pass
+    _draw_separator(win, panel_top, w)
 
     if weather_data is None:
-        _draw_loading_placeholder(win, panel_top, frame)
+        _draw_loading_placeholder(win, panel_top, t)
         return
 
     if "error" in weather_data:
         _draw_error(win, panel_top, weather_data["error"])
         return
 
-    _draw_weather_cards(win, panel_top, weather_data, w)
+    _draw_weather_cards(win, panel_top, weather_data, w, interactive)
+
+
+# Dashboard tile caption
+def draw_tile_info(win, y: int, x: int, w: int, city: str | None, data: dict | None, t: float):
+    """Three-line caption under a dashboard tile: place, conditions, numbers."""
+    if data is None:
+        dots  = "." * (int(t / 0.5) % 4)
+        lines = [(f" {city or 'Auto-detect'}", title_color()),
+                 (f" Fetching{dots}",           general_color())]
+    elif "error" in data:
+        lines = [(f" {city or 'Auto-detect'}",  title_color()),
+                 (f" Error: {data['error']}",   error_color())]
+    else:
+        wtype = data.get("type", "sun")
+        desc  = data.get("desc", "")
+        if data.get("stale"):
+            desc += f" (last known, {_age_text(time.time() - data['fetched_at'])} old)"
+        lines = [
+            (f" {WEATHER_ASCII_LABELS.get(wtype, '?')} {data.get('location', city or '')}", title_color()),
+            (f" {desc}", general_color()),
+            (f" {data['temp_c']}°C / {data['temp_f']}°F  feels {data['feels_c']}°C  "
+             f"{data['humidity']}%  {data['wind_kmph']} km/h", dim_color()),
+        ]
+
+    for i, (text, color) in enumerate(lines):
+        try:
+            win.addstr(y + i, x, text[:w].ljust(w), color)
+        except curses.error:
+            pass
 
 
 # Private helpers
 
-def _draw_loading_placeholder(win, panel_top: int, frame: int):
-    dots = "." * (frame // 10 % 4)
+def _draw_separator(win, panel_top: int, w: int):
+    try:
+        win.addstr(panel_top, 0, "─" * (w - 1), sun_color())
+    except curses.error:
+        pass
+
+
+def _card_columns(w: int) -> list[tuple[int, int]]:
+    """(x, width) of the three info cards for a screen `w` columns wide."""
+    col_w = (w - 2) // 3
+    return [(1, col_w - 1), (col_w + 1, col_w - 1), (col_w * 2 + 1, col_w - 2)]
+
+
+def _draw_loading_placeholder(win, panel_top: int, t: float):
+    dots = "." * (int(t / 0.5) % 4)
     try:
         win.addstr(panel_top + 1, 2, f"  Fetching weather data{dots}", general_color())
     except curses.error:
@@ -81,7 +149,15 @@ def _draw_error(win, panel_top: int, message: str):
         pass
 
 
-def _draw_weather_cards(win, panel_top: int, data: dict, w: int):
+def _age_text(seconds: float) -> str:
+    if seconds < 3600:
+        return f"{max(1, int(seconds // 60))} min"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} d"
+
+
+def _draw_weather_cards(win, panel_top: int, data: dict, w: int, interactive: bool = True):
     wtype    = data.get("type", "sun")
     label    = WEATHER_ASCII_LABELS.get(wtype, "?")
     location = data.get("location", "Unknown")
@@ -92,30 +168,35 @@ def _draw_weather_cards(win, panel_top: int, data: dict, w: int):
     try:
         win.addstr(panel_top + 1, 0, header[:w - 1], title_color())
         suffix = f"  [{desc}]"
+        if data.get("forecast_time"):
+            suffix += f"  (forecast for {data['forecast_time']})"
+        elif data.get("stale"):
+            suffix += f"  (last known, {_age_text(time.time() - data['fetched_at'])} old)"
         win.addstr(panel_top + 1, len(header), suffix[:w - 1 - len(header)], general_color())
     except curses.error:
         pass
 
     # Three cards: Temperature, Wind & Humidity, Visibility
-    row2  = panel_top + 3
-    col_w = (w - 2) // 3
+    row2 = panel_top + 3
+    (x1, w1), (x2, w2), (x3, w3) = _card_columns(w)
 
-    draw_card(win, row2, 1, col_w - 1, [
+    draw_card(win, row2, x1, w1, [
         ("  TEMPERATURE  ",                 sun_color()),
         (f"  {data['temp_c']}°C  /  {data['temp_f']}°F  ", general_color() | curses.A_BOLD),
         (f"  Feels like: {data['feels_c']}°C  ",            general_color()),
     ])
 
-    draw_card(win, row2, col_w + 1, col_w - 1, [
+    draw_card(win, row2, x2, w2, [
         ("  WIND & HUMIDITY  ",             rain_color() | curses.A_BOLD),
         (f"  Humidity: {data['humidity']}%  ", general_color()),
         (f"  Wind: {data['wind_kmph']} km/h  ", general_color()),
     ])
 
-    draw_card(win, row2, col_w * 2 + 1, col_w - 2, [
+    draw_card(win, row2, x3, w3, [
         ("  VISIBILITY  ",                  ground_color() | curses.A_BOLD),
-        (f"  {data['visibility']} km  ",    general_color() | curses.A_BOLD),
-        ("  Press Q to quit  ",             dim_color()),
+        (f"  {data['visibility']} km  " if "visibility" in data else "  not reported  ",
+                                            general_color() | curses.A_BOLD),
+        ("  Press Q to quit  " if interactive else "", dim_color()),
     ])
 
 
@@ -1,12 +1,34 @@
 
 from __future__ import annotations
-try:
-    import requests
-    REQUESTS_OK = True
-except ImportError:
-    REQUESTS_OK = False
+import functools
+import importlib.util
+import re
+import threading
+import time
+from urllib.parse import quote
 
-# Maps keywords in the weather description → internal scene type
+from cache import LOCATION_TTL
+
+# requests (with urllib3 and friends) is only imported on the first network
+# call; demo and cached starts never pay for it
+REQUESTS_OK = importlib.util.find_spec("requests") is not None
+
+# wttr.in (WWO) weather codes → internal scene type. Codes don't depend on
+# the description's language or wording, so they are tried first.
+_SCENE_CODES = {
+    "sun":     (113,),
+    "cloud":   (116, 119, 122),
+    "fog":     (143, 248, 260),
+    "thunder": (200, 386, 389, 392, 395),
+    "rain":    (176, 185, 263, 266, 281, 284, 293, 296, 299, 302, 305, 308,
+                311, 314, 353, 356, 359),
+    "snow":    (179, 182, 227, 230, 317, 320, 323, 326, 329, 332, 335, 338,
+                350, 362, 365, 368, 371, 374, 377),
+}
+_CODE_SCENE = {code: scene for scene, codes in _SCENE_CODES.items() for code in codes}
+
+# Fallback for results without a code: keywords in the weather description
+# → internal scene type, checked in this order
 _CONDITION_KEYWORDS = [
     ("thunder", ["thunder", "storm", "lightning"]),
     ("rain",    ["rain", "drizzle", "shower"]),
@@ -15,9 +37,30 @@ _CONDITION_KEYWORDS = [
     ("cloud",   ["cloud", "overcast"]),
     ("fog",     ["fog", "mist", "haze"]),
 ]
+_CONDITION_PATTERNS = [
+    (scene, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+    for scene, keywords in _CONDITION_KEYWORDS
+]
 
 _HEADERS = {"User-Agent": "WeatherTerm/1.0"}
 
+# wttr.in custom format for lean mode: just the fields we show, "|"-separated
+# (condition, temp, feels like, humidity, wind, location), metric units.
+# It has no visibility field, so lean results leave it out.
+LEAN_FORMAT = "%C|%t|%f|%h|%w|%l"
+_NUMBER     = re.compile(r"[-+]?\d+")
+
+# Column order of a forecast row; rows are stored as plain lists to keep the
+# cache file small
+FORECAST_FIELDS = ("time", "type", "desc", "temp_c", "temp_f", "feels_c",
+                   "humidity", "wind_kmph", "visibility")
+
+# In-process memo of the geolocated city: (value, resolved_at)
+_location: tuple[str, float] | None = None
+
+_session      = None
+_session_lock = threading.Lock()
+
 DEMO_DATA = {
     "type": "sun",
     "desc": "Demo Mode",
@@ -27,23 +70,68 @@ DEMO_DATA = {
 }
 
 
-def classify_condition(description: str) -> str:
-    """Map a weather description string to an internal scene type."""
-    desc_lower = description.lower()
-    for scene_type, keywords in _CONDITION_KEYWORDS:
-        if any(kw in desc_lower for kw in keywords):
+def classify_condition(description: str, code=None) -> str:
+    """
+    Map a weather result to an internal scene type: by its numeric weather
+    code when there is a known one, else by keywords in the description.
+    """
+    try:
+        return _CODE_SCENE[int(code)]
+    except (TypeError, ValueError, KeyError):
+        return _classify_description(description)
+
+
+@functools.lru_cache(maxsize=512)
+def _classify_description(description: str) -> str:
+    for scene_type, pattern in _CONDITION_PATTERNS:
+        if pattern.search(description):
             return scene_type
     return "sun"  # default fallback
 
 
-def get_real_location() -> str | None:
+def _http():
+    """
+    The module's long-lived requests.Session. Its keep-alive connection pool
+    means repeat refreshes reuse warm TCP/TLS connections to ipinfo.io and wttr.in.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            import requests.adapters
+            session = requests.Session()
+            session.headers.update(_HEADERS)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _conditional_headers(validators: dict | None) -> dict:
+    """If-None-Match / If-Modified-Since for a revalidation request."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _validators_of(resp) -> dict:
+    headers = getattr(resp, "headers", None) or {}
+    found   = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+    return {k: v for k, v in found.items() if v}
+
+
+def get_real_location(timeout: float = 5) -> str | None:
     """
     Use ipinfo.io to resolve the user's actual city from their IP.
     wttr.in's own auto-detect uses the ISP's registered IP, which is
     often wrong (e.g. resolves to a data-center city instead of yours).
     """
     try:
-        resp = requests.get("https://ipinfo.io/json", timeout=5, headers=_HEADERS)
+        resp = _http().get("https://ipinfo.io/json", timeout=timeout)
         data = resp.json()
         city    = data.get("city", "")
         country = data.get("country", "")
@@ -54,45 +142,166 @@ def get_real_location() -> str | None:
     return None
 
 
-def fetch_weather(city: str | None = None) -> dict:
+def resolve_location(cache=None, timeout: float = 5) -> str | None:
+    """
+    The user's city, geolocating only when neither this process nor the
+    on-disk cache (a cache.WeatherCache, optional) knows it yet.
+    """
+    global _location
+    if _location and time.time() - _location[1] < LOCATION_TTL:
+        return _location[0]
+
+    city = cache.location() if cache else None
+    if not city:
+        city = get_real_location(timeout)
+        if city and cache:
+            cache.put_location(city)
+    if city:
+        _location = (city, time.time())
+    return city
+
+
+def fetch_weather(city: str | None = None, cache=None, timeout: float = 8,
+                  validators: dict | None = None, lean: bool = False) -> dict:
     """
     Fetch current weather from wttr.in for the given city (or auto-detected
     location). Returns a flat dict with typed weather info, or {"error": ...}
     if something goes wrong.
+
+    `lean` asks for a one-line custom-format response (a few dozen bytes)
+    instead of the full j1 JSON document with its three-day forecast.
+
+    `validators` ({"etag", "last_modified"} from an earlier response) make the
+    request conditional; if the upstream says nothing changed the result is
+    {"not_modified": True}. Fresh results carry their own "validators" when
+    the upstream sent any.
     """
     if not REQUESTS_OK:
         return {"error": "'requests' library not installed. Run: pip install requests"}
 
     try:
         if not city:
-            city = get_real_location()
+            city = resolve_location(cache, timeout=min(5, timeout))
 
-        url  = f"https://wttr.in/{city or ''}?format=j1"
-        resp = requests.get(url, timeout=8, headers=_HEADERS)
-        data = resp.json()
+        if lean:
+            url = f"https://wttr.in/{city or ''}?m&format={quote(LEAN_FORMAT)}"
+        else:
+            url = f"https://wttr.in/{city or ''}?format=j1"
+        resp = _http().get(url, timeout=timeout, headers=_conditional_headers(validators))
+        if resp.status_code == 304:
+            return {"not_modified": True}
+        result = _parse_lean(resp.text) if lean else _parse_j1(resp.json())
 
-        current = data["current_condition"][0]
-        desc    = current["weatherDesc"][0]["value"]
-
-        area     = data["nearest_area"][0]
-        location = f"{area['areaName'][0]['value']}, {area['country'][0]['value']}"
-
-        return {
-            "type":       classify_condition(desc),
-            "desc":       desc,
-            "temp_c":     current["temp_C"],
-            "temp_f":     current["temp_F"],
-            "feels_c":    current["FeelsLikeC"],
-            "humidity":   current["humidity"],
-            "wind_kmph":  current["windspeedKmph"],
-            "visibility": current["visibility"],
-            "location":   location,
-        }
+        received = _validators_of(resp)
+        if received:
+            result["validators"] = received
+        return result
 
     except Exception as exc:
         return {"error": str(exc)}
 
 
+def _parse_j1(data: dict) -> dict:
+    current = data["current_condition"][0]
+    desc    = current["weatherDesc"][0]["value"]
+
+    area     = data["nearest_area"][0]
+    location = f"{area['areaName'][0]['value']}, {area['country'][0]['value']}"
+
+    return {
+        "type":       classify_condition(desc, current.get("weatherCode")),
+        "desc":       desc,
+        "temp_c":     current["temp_C"],
+        "temp_f":     current["temp_F"],
+        "feels_c":    current["FeelsLikeC"],
+        "humidity":   current["humidity"],
+        "wind_kmph":  current["windspeedKmph"],
+        "visibility": current["visibility"],
+        "location":   location,
+        "forecast":   _parse_forecast(data, current),
+    }
+
+
+def _parse_forecast(data: dict, current: dict) -> dict:
+    """
+    The j1 hourly forecast as {"start": i, "rows": [...]}: one row per slot
+    (every 3 h over three days, FORECAST_FIELDS order) and the index of the
+    slot the current observation falls in.
+    """
+    rows = []
+    for day in data.get("weather", []):
+        for hour in day.get("hourly", []):
+            desc = hour["weatherDesc"][0]["value"]
+            hhmm = int(hour["time"])
+            rows.append([
+                f"{day['date']} {hhmm // 100:02d}:{hhmm % 100:02d}",
+                classify_condition(desc, hour.get("weatherCode")), desc,
+                hour["tempC"], hour["tempF"], hour["FeelsLikeC"],
+                hour["humidity"], hour["windspeedKmph"], hour["visibility"],
+            ])
+
+    # "2026-10-18 09:41 AM" -> the last slot starting at or before it
+    start = 0
+    obs   = current.get("localObsDateTime")
+    if obs:
+        try:
+            now   = time.strftime("%Y-%m-%d %H:%M", time.strptime(obs, "%Y-%m-%d %I:%M %p"))
+            start = max(0, sum(1 for row in rows if row[0] <= now) - 1)
+        except ValueError:
+            pass
+    return {"start": start, "rows": rows}
+
+
+def forecast_slots(data: dict | None) -> int:
+    """How many forecast slots lie ahead of the current one (0 without a forecast)."""
+    forecast = (data or {}).get("forecast")
+    if not forecast:
+        return 0
+    return max(0, len(forecast["rows"]) - forecast["start"] - 1)
+
+
+def forecast_view(data: dict, offset: int) -> dict:
+    """
+    The weather dict as it will be `offset` slots from now, for display;
+    offset 0 is the current conditions. Served from the stored timeline, so
+    scrubbing never touches the network.
+    """
+    if offset <= 0 or not forecast_slots(data):
+        return data
+    forecast = data["forecast"]
+    row      = forecast["rows"][forecast["start"] + min(offset, forecast_slots(data))]
+    view     = dict(zip(FORECAST_FIELDS, row))
+    view["forecast_time"] = view.pop("time")
+    return {**data, **view}
+
+
+def _parse_lean(text: str) -> dict:
+    """Parse a LEAN_FORMAT line, e.g. "Light rain|+12°C|+10°C|80%|↓9km/h|London"."""
+    fields = text.strip().split("|")
+    if len(fields) != 6:
+        # wttr.in answers unknown places and overload with a plain sentence
+        raise ValueError(text.strip()[:80] or "empty response")
+    desc, temp, feels, humidity, wind, location = (f.strip() for f in fields)
+
+    def number(field: str) -> str:
+        match = _NUMBER.search(field)
+        if not match:
+            raise ValueError(f"unexpected field {field!r}")
+        return str(int(match.group()))
+
+    temp_c = number(temp)
+    return {
+        "type":      classify_condition(desc),
+        "desc":      desc,
+        "temp_c":    temp_c,
+        "temp_f":    str(round(int(temp_c) * 9 / 5 + 32)),
+        "feels_c":   number(feels),
+        "humidity":  number(humidity),
+        "wind_kmph": number(wind),
+        "location":  location,
+    }
+
+
 def make_demo_data(weather_type: str) -> dict:
     """Return a fake weather dict for the given demo type (no network needed)."""
     return {**DEMO_DATA, "type": weather_type, "desc": f"{weather_type.title()} (Demo)"}